@@ -0,0 +1,307 @@
+"""Headless benchmark suite with baseline regression gates.
+
+Run from the repository root:
+
+    python benchmarks/run_benchmarks.py                      # run and compare to baseline
+    python benchmarks/run_benchmarks.py --only maze          # subset by name
+    python benchmarks/run_benchmarks.py --update-baseline    # rewrite the baseline
+
+Exits with status 1 when any benchmark's median or p99 is slower than the
+baseline by more than its tolerance.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+os.chdir(ROOT)
+
+import pygame  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+BENCHMARKS = []
+
+
+def benchmark(name, iterations=50, warmup=3):
+    def register(setup):
+        BENCHMARKS.append((name, setup, iterations, warmup))
+        return setup
+    return register
+
+
+def percentile(samples, pct):
+    # Nearest-rank percentile
+    ordered = sorted(samples)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def measure(step, iterations, warmup):
+    for _ in range(warmup):
+        step()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        step()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": round(percentile(samples, 50), 4),
+        "p99_ms": round(percentile(samples, 99), 4),
+        "iterations": iterations,
+    }
+
+
+# --- Benchmarks -------------------------------------------------------------
+# Each function does its setup and returns the callable that gets timed.
+
+def make_maze(size, seed=0):
+    from maze import Maze
+    from asset_manager import asset_manager
+    wall_img = asset_manager.image("assets/tiles/wall.png", (64, 64))
+    return Maze(size, size, 64, wall_img, rng=random.Random(seed))
+
+
+for _size in (25, 51, 101, 1001):
+    @benchmark(f"maze.generate_maze[{_size}]", iterations=5 if _size > 101 else 20 if _size > 51 else 50, warmup=1)
+    def _bench_generate(size=_size):
+        maze = make_maze(size)
+        return maze.generate_maze
+
+for _size in (25, 51, 101):
+
+    @benchmark(f"maze.create_walls[{_size}]", iterations=20 if _size > 51 else 50)
+    def _bench_create_walls(size=_size):
+        maze = make_maze(size)
+        return maze.create_walls
+
+
+@benchmark("flow_field.rebuild[101]", iterations=50)
+def _bench_flow_field():
+    from flow_field import FlowField
+    maze = make_maze(101)
+    maze.create_walls(0)
+    field = FlowField(maze.grid, radius=101)
+    tiles = iter(range(10 ** 9))
+    return lambda: field.rebuild((1 + 2 * (next(tiles) % 49), 1))
+
+
+for _moving in (True, False):
+    @benchmark(f"visibility.update[{'new_tile' if _moving else 'same_tile'}]", iterations=200)
+    def _bench_visibility(moving=_moving):
+        from visibility import Visibility
+        maze = make_maze(101)
+        maze.create_walls(0)
+        visibility = Visibility(maze.grid)
+        tiles = iter(range(10 ** 9))
+        return lambda: visibility.update((1 + 2 * (next(tiles) % 49) if moving else 1, 1))
+
+
+@benchmark("visibility.fog[rebuild]", iterations=200)
+def _bench_fog():
+    from visibility import Visibility
+    from camera import Camera
+    maze = make_maze(101)
+    maze.create_walls(0)
+    visibility = Visibility(maze.grid)
+    for x in range(1, 100, 2):  # a long explored corridor
+        visibility.update((x, 1))
+    camera = Camera(800, 600)
+
+    def step():
+        visibility.updates += 1  # force the rebuild a tile change would cause
+        visibility.fog(camera, (800, 600), 240)
+    return step
+
+
+@benchmark("maze_batch.measure_range[100x25]", iterations=10, warmup=1)
+def _bench_maze_batch():
+    from maze_batch import measure_range
+    return lambda: measure_range((0, 100, 25, 25))
+
+
+for _count in (1, 200):
+    @benchmark(f"guardians.update[{_count}]", iterations=200)
+    def _bench_guardians(count=_count):
+        from simulation import Simulation
+        sim = Simulation(seed=0, maze_size=(51, 51), guardians=count)
+        sim.player.invincibility_duration = 10 ** 9
+        sim.player.last_hit_time = sim.clock.get_ticks()
+        return sim.step
+
+
+def make_game_scene():
+    from game import Game
+    from simulation import Simulation
+    from camera import Camera
+
+    game = Game()
+    sim = Simulation(seed=0)
+    camera = Camera(game.INTERNAL_WIDTH, game.INTERNAL_HEIGHT)
+    surface = pygame.Surface((game.INTERNAL_WIDTH, game.INTERNAL_HEIGHT))
+    return game, sim, camera, surface, game.build_static_layer(sim)
+
+
+@benchmark("frame.maze_with_lighting", iterations=200)
+def _bench_maze_frame():
+    game, sim, camera, surface, static_layer = make_game_scene()
+
+    def step():
+        sim.step()
+        camera.update(sim.player)
+        game.draw_maze_scene(surface, sim, camera, static_layer)
+    return step
+
+
+@benchmark("frame.boss_heavy_projectiles", iterations=200)
+def _bench_boss_frame():
+    game, sim, camera, surface, _ = make_game_scene()
+    sim.player.rect.left = sim.exit_rect.right + 1
+    sim.step()
+    boss = sim.boss_map.boss
+    boss.attack_interval = 10 ** 9  # keep the load fixed
+    sim.player.invincibility_duration = 10 ** 9
+    sim.player.last_hit_time = sim.clock.get_ticks()
+    for i in range(100):
+        boss.projectiles.spawn_ring(*boss.rect.center, 20, 200, sim.clock.get_ticks(), offset=i * 3.6)
+
+    def step():
+        sim.step()
+        camera.update(sim.player)
+        game.draw_boss_scene(surface, sim, camera)
+    return step
+
+
+for _window in ((800, 600), (1280, 720), (1600, 1200), (1920, 1080)):
+    @benchmark(f"present.scale_and_blit[{_window[0]}x{_window[1]}]", iterations=100)
+    def _bench_scale_and_blit(window=_window):
+        from game import Game
+        game = Game()
+        display_surface = pygame.display.set_mode(window)
+        internal_surface = pygame.Surface((game.INTERNAL_WIDTH, game.INTERNAL_HEIGHT))
+        return lambda: game.scale_and_blit(display_surface, internal_surface)
+
+
+for _window in ((800, 600), (1600, 1200)):
+    @benchmark(f"present.renderer[software,{_window[0]}x{_window[1]}]", iterations=100)
+    def _bench_renderer(window=_window):
+        from presenter import Presenter
+        presenter = Presenter((800, 600))
+        display_surface = presenter.open_window("benchmark", renderer="software")
+        presenter.backend.window.size = window
+        internal_surface = pygame.Surface((800, 600))
+        return lambda: presenter.present(display_surface, internal_surface)
+
+
+@benchmark("menu.draw", iterations=100)
+def _bench_menu_draw():
+    from menu import Menu
+    menu = Menu(pygame.display.set_mode((800, 600)))
+    menu.create_option_rects()
+    return menu.draw
+
+
+for _source in ("png", "atlas"):
+    @benchmark(f"assets.cold_load[{_source}]", iterations=10, warmup=1)
+    def _bench_cold_load(source=_source):
+        # Every sprite at its in-game size, from an empty asset cache
+        from asset_manager import asset_manager
+        from atlas import load_atlas, sprite_specs
+        specs = sprite_specs()
+        if source == "atlas":
+            load_atlas()  # make sure the cache is built before timing
+
+        def step():
+            asset_manager.clear()
+            if source == "atlas":
+                asset_manager.use_atlas(load_atlas())
+            for path, size in specs:
+                asset_manager.image(path, size)
+        return step
+
+
+# --- Runner -----------------------------------------------------------------
+
+def compare(results, baseline, default_tolerance):
+    # A tolerance is a fraction (0.5 = 50% slower allowed), either one number
+    # for both metrics or a {"median_ms": ..., "p99_ms": ...} mapping.
+    failures = []
+    tolerances = baseline.get("tolerances", {})
+    for name, result in results.items():
+        expected = baseline.get("results", {}).get(name)
+        if expected is None:
+            continue
+        tolerance = tolerances.get(name, default_tolerance)
+        for metric in ("median_ms", "p99_ms"):
+            allowed = tolerance[metric] if isinstance(tolerance, dict) else tolerance
+            limit = expected[metric] * (1 + allowed)
+            if result[metric] > limit:
+                failures.append(f"{name} {metric}: {result[metric]:.3f} ms > {limit:.3f} ms "
+                                f"(baseline {expected[metric]:.3f} ms, tolerance {allowed:.0%})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the headless benchmark suite.")
+    parser.add_argument("--only", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--output", default="", help="write results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="allowed slowdown as a fraction (overrides the baseline default)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+
+    results = {}
+    for name, setup, iterations, warmup in BENCHMARKS:
+        if args.only and args.only not in name:
+            continue
+        results[name] = measure(setup(), iterations, warmup)
+        print(f"{name:<40} median {results[name]['median_ms']:8.3f} ms   p99 {results[name]['p99_ms']:8.3f} ms")
+
+    report = {
+        "machine": {"python": platform.python_version(), "pygame": pygame.version.ver, "platform": platform.platform()},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.setdefault("default_tolerance", {"median_ms": 0.5, "p99_ms": 2.0})
+        baseline.setdefault("tolerances", {})
+        baseline["machine"] = report["machine"]
+        baseline.setdefault("results", {}).update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found, skipping comparison")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    tolerance = args.tolerance if args.tolerance is not None else baseline.get("default_tolerance", 0.5)
+    failures = compare(results, baseline, tolerance)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+import os
+import queue
+import threading
+import time
+import pygame
+from text_cache import text_cache
+from audio import audio
+
+
+class SilentSound:
+    # Stand-in used when the mixer is not initialized (e.g. headless runs)
+    def play(self, *args, **kwargs):
+        pass
+
+    def stop(self):
+        pass
+
+    def set_volume(self, volume):
+        pass
+
+
+def bake_flash(image):
+    # White silhouette with the frame's own alpha
+    flash = image.copy()
+    flash.fill((255, 255, 255), special_flags=pygame.BLEND_RGB_ADD)
+    return flash
+
+
+class AnimationSet:
+    # Every direction's frames for one (folder, size), shared by all the
+    # entities that use it. Frames are never drawn on or given a surface
+    # alpha; visual states are pre-baked variants, so switching is a swap.
+    DIRECTIONS = ("down", "up", "left", "right")
+
+    def __init__(self, frames, manager):
+        self.manager = manager
+        self.variants = {"normal": frames}  # variant -> direction -> tuple of frames
+
+    def bake(self, variant, image):
+        if variant == "hidden":
+            return self.manager.blank(image.get_size())
+        if variant == "flash":
+            return bake_flash(image)
+        raise ValueError(f"Unknown animation variant {variant!r}")
+
+    def frames(self, variant="normal"):
+        frames = self.variants.get(variant)
+        if frames is None:
+            frames = self.variants[variant] = {
+                direction: tuple(self.bake(variant, image) for image in images)
+                for direction, images in self.variants["normal"].items()
+            }
+        return frames
+
+
+class AssetManager:
+    def __init__(self):
+        self.sources = {}  # path -> decoded surface, straight from disk
+        self.atlas = {}    # (path, size) -> pre-scaled surface from the atlas cache
+        self.images = {}   # (path, size, mode, angle) -> ready-to-blit surface
+        self.frame_sets = {}  # (folder, size, mode) -> list of frames
+        self.animation_sets = {}  # (folder, size) -> AnimationSet
+        self.blanks = {}  # size -> fully transparent surface
+        self.sounds = {}
+        self.hits = 0
+        self.misses = 0
+        self.disk_loads = 0
+
+    def load_source(self, path):
+        source = self.sources.get(path)
+        if source is None:
+            source = pygame.image.load(path)
+            self.sources[path] = source
+            self.disk_loads += 1
+        return source
+
+    def image(self, path, size=None, mode="alpha", angle=0):
+        if pygame.display.get_surface() is None:
+            mode = None  # conversion needs a display mode
+        key = (path, tuple(size) if size else None, mode, angle)
+        image = self.images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        packed = None if angle else self.atlas.get((path, key[1]))
+        image = packed if packed is not None else self.load_source(path)
+        if mode == "alpha":
+            image = image.convert_alpha()
+        elif mode == "opaque":
+            image = image.convert()
+        if packed is None:
+            if angle:
+                image = pygame.transform.rotate(image, angle)
+            if size:
+                image = pygame.transform.scale(image, size)
+        self.images[key] = image
+        return image
+
+    def use_atlas(self, sprites):
+        # sprites: {(path, size): surface} as returned by atlas.load_atlas()
+        self.atlas = sprites
+
+    def frames(self, folder, size, mode="alpha"):
+        key = (folder, size, mode)
+        frames = self.frame_sets.get(key)
+        if frames is None:
+            frames = [
+                self.image(os.path.join(folder, filename), (size, size), mode)
+                for filename in sorted(os.listdir(folder))
+                if filename.endswith(".png")
+            ]
+            self.frame_sets[key] = frames
+        return frames
+
+    def animation_set(self, folder, size):
+        key = (folder, size)
+        animations = self.animation_sets.get(key)
+        if animations is None:
+            animations = self.animation_sets[key] = AnimationSet({
+                direction: tuple(self.frames(os.path.join(folder, direction), size))
+                for direction in AnimationSet.DIRECTIONS
+            }, self)
+        return animations
+
+    def blank(self, size):
+        # Fully transparent stand-in, one per size, for the "off" half of a flicker
+        blank = self.blanks.get(size)
+        if blank is None:
+            blank = self.blanks[size] = pygame.Surface(size, pygame.SRCALPHA)
+        return blank
+
+    def sound(self, path, volume=None):
+        if not pygame.mixer.get_init():
+            return SilentSound()
+        sound = self.sounds.get(path)
+        if sound is None:
+            self.misses += 1
+            sound = audio.call(pygame.mixer.Sound, path)
+            self.sounds[path] = sound
+            self.disk_loads += 1
+        else:
+            self.hits += 1
+        if volume is not None:
+            audio.call(sound.set_volume, volume)
+        return sound
+
+    def warm_up(self, images=(), sounds=()):
+        # Each image spec is the argument tuple for image()
+        for spec in images:
+            self.image(*spec)
+        for path in sounds:
+            self.sound(path)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_loads": self.disk_loads,
+            "images": len(self.images),
+            "atlas": len(self.atlas),
+            "sounds": len(self.sounds),
+        }
+
+    def clear(self):
+        self.sources.clear()
+        self.atlas = {}
+        self.images.clear()
+        self.frame_sets.clear()
+        self.animation_sets.clear()
+        self.blanks.clear()
+        self.sounds.clear()
+
+
+class Preloader:
+    # Decodes upcoming scenes' files on a worker thread. Decoding is the
+    # disk-bound part; converting to the display format has to happen on the
+    # main thread, so decoded specs are queued and finished off by pump(),
+    # a few per frame, or all at once by finish().
+    def __init__(self, manager):
+        self.manager = manager
+        self.ready = queue.Queue()
+        self.threads = []
+
+    def start(self, images=(), frames=(), sounds=(), fonts=()):
+        # Same spec formats as warm_up(); frames are (folder, size) pairs and
+        # fonts are text_cache.font() argument tuples, loaded on the main thread
+        for spec in fonts:
+            self.ready.put(("font", spec))
+        thread = threading.Thread(target=self.work, args=(list(images), list(frames), list(sounds)), daemon=True)
+        self.threads.append(thread)
+        thread.start()
+
+    def work(self, images, frames, sounds):
+        manager = self.manager
+        for path in sounds:
+            manager.sound(path)
+        for folder, size in frames:
+            for filename in sorted(os.listdir(folder)):
+                if filename.endswith(".png"):
+                    self.decode(os.path.join(folder, filename), (size, size))
+            self.ready.put(("frames", (folder, size)))
+        for spec in images:
+            self.decode(*spec[:2])
+            self.ready.put(("image", spec))
+
+    def decode(self, path, size=None):
+        if (path, tuple(size) if size else None) not in self.manager.atlas:
+            self.manager.load_source(path)
+
+    def busy(self):
+        return any(thread.is_alive() for thread in self.threads)
+
+    def pump(self, budget_ms=2):
+        # Convert queued images until the budget runs out; None means no limit
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+        while deadline is None or time.perf_counter() < deadline:
+            try:
+                kind, spec = self.ready.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "frames":
+                self.manager.frames(*spec)
+            elif kind == "font":
+                text_cache.font(*spec)
+            else:
+                self.manager.image(*spec)
+
+    def finish(self):
+        for thread in self.threads:
+            thread.join()
+        self.threads.clear()
+        self.pump(None)
+
+
+asset_manager = AssetManager()
+preloader = Preloader(asset_manager)
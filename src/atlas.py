@@ -0,0 +1,146 @@
+import json
+import mmap
+import os
+import numpy as np
+import pygame
+
+CACHE_DIR = "cache"
+MANIFEST = "atlas.json"
+PAGES = "atlas.bin"
+PAGE_WIDTH = 2048
+PAGE_HEIGHT = 2048
+VERSION = 1
+
+
+def sprite_specs():
+    # Every (path, size) the game asks the asset manager for, at its in-game size
+    tile = (64, 64)
+    specs = [("assets/tiles/wall.png", tile), ("assets/tiles/floor.png", tile)]
+    specs += [(f"assets/tiles/spike_{i}.png", tile) for i in range(1, 5)]
+    specs += [(f"assets/tiles/fire_{i}.png", tile) for i in range(1, 13)]
+
+    for folder, size in (("assets/player", 96), ("assets/boss", 128), ("assets/boss", 64)):
+        for direction in ("down", "up", "left", "right"):
+            path = os.path.join(folder, direction)
+            specs += [
+                (os.path.join(path, filename), (size, size))
+                for filename in sorted(os.listdir(path))
+                if filename.endswith(".png")
+            ]
+
+    specs += [
+        ("assets/projectiles/fireball.png", (12, 12)),
+        ("assets/projectiles/spear.png", (32, 32)),
+        ("BrickBg.png", (800, 600)),
+        ("assets/backgrounds/boss_background.png", (640, 640)),
+        ("assets/backgrounds/cutscene_background.png", (800, 600)),
+        ("assets/backgrounds/intro_background.png", (800, 600)),
+    ]
+    for name in ("start", "Options", "Quit", "FullScreen", "Back", "Volume"):
+        specs.append((f"assets/Menu/{name}.png", (240, 150)))
+    return specs
+
+
+def source_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def pack(specs):
+    # Shelf packing: tallest sprites first, left to right in rows, a new page
+    # when a row no longer fits. Returns {spec: (page, x, y)} and page sizes.
+    placements = {}
+    pages = []
+    x = y = shelf_height = 0
+    for spec in sorted(specs, key=lambda s: (s[1][1], s[1][0]), reverse=True):
+        w, h = spec[1]
+        if x + w > PAGE_WIDTH:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if not pages or y + h > PAGE_HEIGHT:
+            pages.append([0, 0])
+            x = y = shelf_height = 0
+        placements[spec] = (len(pages) - 1, x, y)
+        pages[-1][0] = max(pages[-1][0], x + w)
+        pages[-1][1] = max(pages[-1][1], y + h)
+        x += w
+        shelf_height = max(shelf_height, h)
+    return placements, pages
+
+
+def build_atlas(cache_dir=CACHE_DIR, specs=None):
+    specs = [(path, tuple(size)) for path, size in (specs or sprite_specs())]
+    placements, page_sizes = pack(specs)
+    pages = [np.zeros((h, w, 4), dtype=np.uint8) for w, h in page_sizes]
+
+    for spec, (page, x, y) in placements.items():
+        path, (w, h) = spec
+        image = pygame.transform.scale(pygame.image.load(path), (w, h))
+        pixels = np.frombuffer(pygame.image.tobytes(image, "RGBA"), dtype=np.uint8).reshape(h, w, 4)
+        pages[page][y:y + h, x:x + w] = pixels
+
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = {"version": VERSION, "pages": [], "sprites": [], "sources": {}}
+    with open(os.path.join(cache_dir, PAGES), "wb") as f:
+        for pixels in pages:
+            manifest["pages"].append({"offset": f.tell(), "width": pixels.shape[1], "height": pixels.shape[0]})
+            f.write(pixels.tobytes())
+    for (path, (w, h)), (page, x, y) in placements.items():
+        manifest["sprites"].append([path, w, h, page, x, y])
+        manifest["sources"][path] = source_stamp(path)
+    # Written last, so an interrupted build is seen as stale next time
+    with open(os.path.join(cache_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+def is_stale(manifest, specs):
+    if manifest.get("version") != VERSION:
+        return True
+    packed = {(path, (w, h)) for path, w, h, *_ in manifest["sprites"]}
+    if packed != {(path, tuple(size)) for path, size in specs}:
+        return True
+    try:
+        return any(source_stamp(path) != stamp for path, stamp in manifest["sources"].items())
+    except OSError:
+        return True
+
+
+def load_atlas(cache_dir=CACHE_DIR, rebuild=True):
+    # Returns {(path, size): surface}. Pages are memory-mapped and wrapped
+    # without decoding; the cache is rebuilt first if any source changed.
+    manifest_path = os.path.join(cache_dir, MANIFEST)
+    manifest = None
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    if manifest is None or (rebuild and is_stale(manifest, sprite_specs())):
+        if not rebuild:
+            return {}
+        manifest = build_atlas(cache_dir)
+
+    with open(os.path.join(cache_dir, PAGES), "rb") as f:
+        # Copy-on-write, so a stray draw onto a sprite can't touch the file
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    view = memoryview(data)
+    pages = []
+    for page in manifest["pages"]:
+        size = page["width"] * page["height"] * 4
+        buffer = view[page["offset"]:page["offset"] + size]
+        pages.append(pygame.image.frombuffer(buffer, (page["width"], page["height"]), "RGBA"))
+
+    return {
+        (path, (w, h)): pages[page].subsurface((x, y, w, h))
+        for path, w, h, page, x, y in manifest["sprites"]
+    }
+
+
+if __name__ == "__main__":
+    # Build step, run from the repository root:
+    #   python src/atlas.py
+    import time
+
+    start = time.perf_counter()
+    manifest = build_atlas()
+    total = sum(page["width"] * page["height"] * 4 for page in manifest["pages"])
+    print(f"Packed {len(manifest['sprites'])} sprites into {len(manifest['pages'])} page(s), "
+          f"{total / 1024 / 1024:.1f} MB, in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import deque
+import pygame
+
+
+class AudioManager:
+    # Music tracks are decoded once into Sounds and played on two reserved
+    # channels, so switching tracks is a crossfade instead of a stop, a
+    # blocking decode and a gap. All mixer work runs on one worker thread:
+    # SDL_mixer holds the audio lock while it decodes, so even a fadeout()
+    # on the main thread would stall the frame until a decode finished.
+    MUSIC_CHANNELS = 2
+
+    def __init__(self, volume=0.5, crossfade_ms=800):
+        self.volume = volume
+        self.crossfade_ms = crossfade_ms
+        self.muted = False
+        self.tracks = {}      # path -> decoded Sound, or None if it failed to load
+        self.requested = set()
+        self.current = None   # track most recently asked for by play()
+
+        self.commands = deque()  # run before any queued decode
+        self.decodes = deque()
+        self.wakeup = threading.Condition()
+        self.worker = None
+        self.channels = None
+        self.active = 0       # index of the channel playing the current track
+
+        self.frame_ms = 0.0   # main-thread audio time (queueing and mixer calls) in the current frame
+        self.last_frame_ms = 0.0
+        self.max_frame_ms = 0.0
+        self.worker_ms = 0.0  # total time the worker spent decoding and mixing
+
+    def enabled(self):
+        return pygame.mixer.get_init() is not None
+
+    def submit(self, queue, job):
+        start = time.perf_counter()
+        with self.wakeup:
+            if self.worker is None:
+                self.worker = threading.Thread(target=self.work, daemon=True)
+                self.worker.start()
+            queue.append(job)
+            self.wakeup.notify()
+        self.frame_ms += (time.perf_counter() - start) * 1000
+
+    def work(self):
+        while True:
+            with self.wakeup:
+                while not self.commands and not self.decodes:
+                    self.wakeup.wait()
+                job = self.commands.popleft() if self.commands else self.decodes.popleft()
+            start = time.perf_counter()
+            job()
+            self.worker_ms += (time.perf_counter() - start) * 1000
+
+    # --- Loading (worker thread) --------------------------------------------
+
+    def prefetch(self, *paths):
+        if not self.enabled():
+            return
+        for path in paths:
+            if path not in self.requested:
+                self.requested.add(path)
+                self.submit(self.decodes, lambda path=path: self.load(path))
+
+    def load(self, path):
+        if path in self.tracks:
+            return self.tracks[path]
+        try:
+            sound = pygame.mixer.Sound(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"[Error] Failed to load music {path}: {e}")
+            sound = None
+        self.tracks[path] = sound
+        return sound
+
+    def get_channels(self):
+        if self.channels is None:
+            pygame.mixer.set_reserved(self.MUSIC_CHANNELS)
+            self.channels = [pygame.mixer.Channel(i) for i in range(self.MUSIC_CHANNELS)]
+        return self.channels
+
+    def start_track(self, path, loops, fade_ms):
+        self.requested.add(path)
+        sound = self.load(path)
+        if path != self.current:
+            return  # another track was requested while this one decoded
+        channels = self.get_channels()
+        channels[self.active].fadeout(fade_ms)
+        if sound is None:
+            return
+        self.active = (self.active + 1) % self.MUSIC_CHANNELS
+        channel = channels[self.active]
+        channel.set_volume(0.0 if self.muted else self.volume)
+        channel.play(sound, loops, fade_ms=fade_ms)
+
+    def fade_all(self, fade_ms):
+        for channel in self.get_channels():
+            channel.fadeout(fade_ms)
+
+    def apply_volume(self):
+        self.get_channels()[self.active].set_volume(0.0 if self.muted else self.volume)
+
+    # --- Main-thread API ----------------------------------------------------
+
+    def play(self, path, loops=-1, fade_ms=None):
+        # Crossfade to path; returns straight away even if it still has to decode
+        if not self.enabled() or path == self.current:
+            return
+        self.current = path
+        fade_ms = self.crossfade_ms if fade_ms is None else fade_ms
+        self.submit(self.commands, lambda: self.start_track(path, loops, fade_ms))
+
+    def stop(self, fade_ms=None):
+        if not self.enabled():
+            return
+        self.current = None
+        fade_ms = self.crossfade_ms if fade_ms is None else fade_ms
+        self.submit(self.commands, lambda: self.fade_all(fade_ms))
+
+    def play_clip(self, sound, loops=0):
+        # Short effects (already cached by the asset manager)
+        if self.enabled():
+            self.submit(self.commands, lambda: sound.play(loops))
+
+    def stop_clip(self, sound):
+        if self.enabled():
+            self.submit(self.commands, sound.stop)
+
+    def call(self, function, *args):
+        # A mixer call that has to return its result, e.g. loading a Sound;
+        # timed into frame_ms when it runs on the main thread
+        if threading.current_thread() is not threading.main_thread():
+            return function(*args)
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.frame_ms += (time.perf_counter() - start) * 1000
+
+    def set_volume(self, volume):
+        self.volume = volume
+        if self.enabled():
+            self.submit(self.commands, self.apply_volume)
+
+    def set_muted(self, muted):
+        self.muted = muted
+        if self.enabled():
+            self.submit(self.commands, self.apply_volume)
+
+    # --- Timing -------------------------------------------------------------
+
+    def end_frame(self):
+        # Call once per frame; returns the main-thread mixer time of that frame (ms)
+        self.last_frame_ms = self.frame_ms
+        self.max_frame_ms = max(self.max_frame_ms, self.frame_ms)
+        self.frame_ms = 0.0
+        return self.last_frame_ms
+
+    def stats(self):
+        return {
+            "last_frame_ms": round(self.last_frame_ms, 3),
+            "max_frame_ms": round(self.max_frame_ms, 3),
+            "worker_ms": round(self.worker_ms, 1),
+            "tracks": sum(1 for sound in self.tracks.values() if sound is not None),
+            "queued": len(self.commands) + len(self.decodes),
+            "current": self.current,
+        }
+
+
+audio = AudioManager()
@@ -1,11 +1,11 @@
 import pygame
+from asset_manager import asset_manager
 
 
 class Background(pygame.sprite.Sprite):
     def __init__(self, image_path="assets/tiles/floor.png", width=1600, height=1200, tile_size=64):
         super().__init__()
-        tile_image = pygame.image.load(image_path).convert()
-        tile_image = pygame.transform.scale(tile_image, (tile_size, tile_size))
+        tile_image = asset_manager.image(image_path, (tile_size, tile_size), "opaque")
 
 
         self.image = pygame.Surface((width, height))
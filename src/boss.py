@@ -4,24 +4,14 @@ import math
 import os
 from projectile import Projectile
 from entity import Entity
-
-class BossProjectile(Projectile):
-    def __init__(self, x, y, angle, speed=200):
-        super().__init__(
-            x, y,
-            image_path="assets/projectiles/fireball.png",
-            angle=angle,
-            speed=speed,
-            size=(12, 12),
-            ttl=8000,
-            rotate_image=False
-        )
+from asset_manager import asset_manager
+from bullet_engine import BulletEngine
+from hud import Widget
 
 class Spear(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
-        self.original_image = pygame.image.load("assets/projectiles/spear.png").convert_alpha()
-        self.image = pygame.transform.scale(self.original_image, (32, 32))
+        self.image = asset_manager.image("assets/projectiles/spear.png", (32, 32))
         self.rect = self.image.get_rect(center=(x, y))
         self.direction = pygame.Vector2()
 
@@ -29,7 +19,7 @@ class Spear(pygame.sprite.Sprite):
         screen.blit(self.image, camera.apply(self))
 
 class PlayerProjectile(Projectile):
-    def __init__(self, x, y, direction):
+    def __init__(self, x, y, direction, spawn_time=None):
         angle = -math.degrees(math.atan2(-direction.y, -direction.x)) + 90
         super().__init__(
             x, y,
@@ -38,16 +28,24 @@ class PlayerProjectile(Projectile):
             speed=400,
             size=(32, 32),
             ttl=5000,
-            rotate_image=True
+            rotate_image=True,
+            spawn_time=spawn_time
         )
         self.vel = direction.normalize() * 400
 
 class Boss(Entity):
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=None):
         super().__init__(x, y, "assets/boss", 128)
+        self.rng = rng or random
         self.hitbox = self.rect.inflate(-40, -40)
 
-        self.projectiles = pygame.sprite.Group()
+        self.projectiles = BulletEngine(
+            asset_manager.image("assets/projectiles/fireball.png", (12, 12)),
+            size=(12, 12),
+            ttl=8000,
+            light_radius=40
+        )
+        self.projectile_speed = 200
         self.last_attack_time = 0
         self.attack_interval = 2000
 
@@ -55,6 +53,9 @@ class Boss(Entity):
         self.move_timer = 0
         self.frame_rate = 0.15
 
+        self.last_hit_time = None
+        self.flash_duration = 100
+
     def update(self, dt, current_time, player, hp_bar, player_projectiles):
         if not self.alive:
             return
@@ -83,47 +84,62 @@ class Boss(Entity):
         self.move_timer += dt
         if self.move_timer > 2:
             self.move_timer = 0
-            self.target_pos = pygame.Vector2(random.randint(64, 500 - 64), random.randint(64, 500 - 64))
+            self.target_pos = pygame.Vector2(self.rng.randint(64, 500 - 64), self.rng.randint(64, 500 - 64))
 
         # Attack
         if current_time - self.last_attack_time > self.attack_interval:
-            self.shoot_projectiles()
+            self.shoot_projectiles(current_time)
             self.last_attack_time = current_time
 
-        self.projectiles.update(dt)
+        self.projectiles.update(dt, current_time)
 
         # Check hit player
-        for proj in self.projectiles:
-            if proj.rect.colliderect(player.hitbox):
-                if current_time - player.last_hit_time >= player.invincibility_duration:
-                    player.take_damage(5, current_time, hp_bar)
-                    proj.kill()
+        if current_time - player.last_hit_time >= player.invincibility_duration:
+            hits = self.projectiles.hits(player.hitbox)
+            if len(hits):
+                player.take_damage(5, current_time, hp_bar)
+                self.projectiles.kill(hits[:1])
 
         # Check hit by player
         for proj in player_projectiles:
             if proj.rect.colliderect(self.hitbox):
                 self.take_damage(10)
+                self.last_hit_time = current_time
                 proj.kill()
 
-    def shoot_projectiles(self):
-        for angle in range(0, 360, 20):
-            proj = BossProjectile(self.rect.centerx, self.rect.centery, angle)
-            self.projectiles.add(proj)
+        flashing = self.last_hit_time is not None and current_time - self.last_hit_time < self.flash_duration
+        self.set_variant("flash" if flashing else "normal")
+
+    def shoot_projectiles(self, current_time):
+        self.projectiles.spawn_ring(self.rect.centerx, self.rect.centery, 18, self.projectile_speed, current_time)
 
     def draw(self, screen, camera, debug=False):
         screen.blit(self.image, camera.apply(self))
-        for proj in self.projectiles:
-            screen.blit(proj.image, camera.apply(proj))
-            if debug:
-                pygame.draw.rect(screen, (255, 0, 0), camera.apply(proj), 1)
+        self.projectiles.draw(screen, camera, debug)
 
         if debug:
             pygame.draw.rect(screen, (0, 255, 0), camera.apply_rect(self.hitbox), 1)
 
-        bar_width = 80
-        bar_height = 8
-        bar_x = self.rect.centerx - bar_width // 2
-        bar_y = self.rect.top - 15
-        hp_ratio = self.health / self.max_health
-        pygame.draw.rect(screen, (0, 0, 0), camera.apply_rect(pygame.Rect(bar_x, bar_y, bar_width, bar_height)))
-        pygame.draw.rect(screen, (255, 0, 0), camera.apply_rect(pygame.Rect(bar_x, bar_y, int(bar_width * hp_ratio), bar_height)))
+
+class BossHealthBar(Widget):
+    # Follows the boss in world space; drawn by the HUD
+    def __init__(self, boss, width=80, height=8):
+        super().__init__()
+        self.boss = boss
+        self.width = width
+        self.height = height
+
+    def state(self):
+        return self.boss.health
+
+    def render(self, health):
+        image = pygame.Surface((self.width, self.height))
+        image.fill((0, 0, 0))
+        hp_ratio = health / self.boss.max_health
+        image.fill((255, 0, 0), (0, 0, int(self.width * hp_ratio), self.height))
+        return image
+
+    def position(self, surface, camera):
+        x = self.boss.rect.centerx - self.width // 2
+        y = self.boss.rect.top - 15
+        return (x - camera.offset.x, y - camera.offset.y)
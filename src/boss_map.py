@@ -1,25 +1,50 @@
 import pygame
 import random
-from boss import Boss, Spear, PlayerProjectile
+from boss import Boss, Spear, PlayerProjectile, BossHealthBar
+from static_layer import StaticLayer
+from asset_manager import asset_manager
+from text_cache import text_cache
+from controls import KeyboardInput
+from hud import Widget
+
+
+class SpearPrompt(Widget):
+    # Shown while the player is holding the spear
+    def __init__(self, player, font, color):
+        super().__init__()
+        self.player = player
+        self.font = font
+        self.color = color
+
+    def state(self):
+        return True if self.player.has_spear else None
+
+    def render(self, state):
+        return text_cache.render(self.font, 'Press "E" to throw spear', self.color)
+
+    def position(self, surface, camera):
+        rect = self.cached_image.get_rect(midbottom=(surface.get_width() // 2, surface.get_height() - 20))
+        return rect.topleft
+
 
 class BossMap:
     TILE_SIZE = 64
 
-    def __init__(self, width=640, height=640):
+    def __init__(self, width=640, height=640, rng=None):
+        self.rng = rng or random
         self.width = width
         self.height = height
 
-        self.background = pygame.image.load("assets/backgrounds/boss_background.png").convert()
-        self.background = pygame.transform.scale(self.background, (width, height))
+        self.background = asset_manager.image("assets/backgrounds/boss_background.png", (width, height), "opaque")
+        self.wall_image = asset_manager.image("assets/tiles/wall.png", (self.TILE_SIZE, self.TILE_SIZE))
 
-        self.wall_image = pygame.image.load("assets/tiles/wall.png").convert_alpha()
-        self.wall_image = pygame.transform.scale(self.wall_image, (self.TILE_SIZE, self.TILE_SIZE))
-
-        self.surface = pygame.Surface((width, height))
         self.walls = self.create_walls()
         self.wall_rects = [pygame.Rect(x, y, self.TILE_SIZE, self.TILE_SIZE) for x, y in self.walls]
 
-        self.boss = Boss(width // 2, height // 2)
+        # Baked with the level; headless runs have no display and never draw
+        self.static_layer = self.build_static_layer() if pygame.display.get_surface() else None
+
+        self.boss = Boss(width // 2, height // 2, self.rng)
         self.spear = None
         self.last_spear_spawn_time = 0
         self.spear_spawn_interval = 10000  # ms
@@ -28,7 +53,7 @@ class BossMap:
         self.last_throw_time = 0
 
         # Font for displaying "Press E" text
-        self.font = pygame.font.Font(None, 32)
+        self.font = text_cache.font(None, 32, sysfont=False)
         self.text_color = (255, 255, 255)
 
     def create_walls(self):
@@ -43,7 +68,7 @@ class BossMap:
             walls.append(((tiles_x - 1) * self.TILE_SIZE, y * self.TILE_SIZE))
         return walls
 
-    def update(self, dt, current_time, player, hp_bar, player_projectiles):
+    def update(self, dt, current_time, player, hp_bar, player_projectiles, controls=None):
         self.boss.update(dt, current_time, player, hp_bar, player_projectiles)
 
         # Clamp boss inside walls
@@ -87,9 +112,10 @@ class BossMap:
             self.spear = None
 
         # Handle spear throw
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_e] and player.has_spear and current_time - self.last_throw_time > self.throw_cooldown:
-            self.throw_spear(player, player_projectiles)
+        if controls is None:
+            controls = KeyboardInput().poll()
+        if controls.throw and player.has_spear and current_time - self.last_throw_time > self.throw_cooldown:
+            self.throw_spear(player, player_projectiles, current_time)
             player.has_spear = False
             self.last_throw_time = current_time
 
@@ -98,7 +124,7 @@ class BossMap:
             self.spawn_spear()
             self.last_spear_spawn_time = current_time
 
-    def throw_spear(self, player, projectile_group):
+    def throw_spear(self, player, projectile_group, current_time=None):
         direction = pygame.Vector2(0, 0)
         if player.direction == "up":
             direction = pygame.Vector2(0, -1)
@@ -109,26 +135,29 @@ class BossMap:
         elif player.direction == "right":
             direction = pygame.Vector2(1, 0)
 
-        proj = PlayerProjectile(player.rect.centerx, player.rect.centery, direction)
+        proj = PlayerProjectile(player.rect.centerx, player.rect.centery, direction, current_time)
         projectile_group.add(proj)
 
     def spawn_spear(self):
-        x = random.randint(100, self.width - 100)
-        y = random.randint(100, self.height - 100)
+        x = self.rng.randint(100, self.width - 100)
+        y = self.rng.randint(100, self.height - 100)
         self.spear = Spear(x, y)
 
-    def draw(self, screen, camera, player, debug=False):
-        self.surface.blit(self.background, (0, 0))
+    def build_static_layer(self):
+        static_layer = StaticLayer(self.width, self.height)
+        static_layer.add(self.background, (0, 0))
         for wall_pos in self.walls:
-            self.surface.blit(self.wall_image, wall_pos)
-        screen.blit(self.surface, (-camera.offset.x, -camera.offset.y))
+            static_layer.add(self.wall_image, wall_pos)
+        return static_layer
+
+    def draw(self, screen, camera, player, debug=False):
+        if self.static_layer is None:
+            self.static_layer = self.build_static_layer()  # a headless session being rendered
+        self.static_layer.draw(screen, camera)
 
         self.boss.draw(screen, camera, debug)
         if self.spear:
             self.spear.draw(screen, camera)
 
-        # Draw spear usage text if player has it
-        if player.has_spear:
-            text_surface = self.font.render('Press "E" to throw spear', True, self.text_color)
-            text_rect = text_surface.get_rect(midbottom=(screen.get_width() // 2, screen.get_height() - 20))
-            screen.blit(text_surface, text_rect)
+    def hud_widgets(self, player):
+        return [BossHealthBar(self.boss), SpearPrompt(player, self.font, self.text_color)]
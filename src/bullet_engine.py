@@ -0,0 +1,119 @@
+import numpy as np
+import pygame
+
+
+class BulletEngine:
+    def __init__(self, image, size=(12, 12), ttl=8000, light_radius=0, capacity=256):
+        self.image = image
+        self.size = size
+        self.half = np.array(size, dtype=np.float32) / 2
+        self.default_ttl = ttl
+        self.light_radius = light_radius
+
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.spawn_time = np.zeros(capacity, dtype=np.int64)
+        self.ttl = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self):
+        return self.count
+
+    def reserve(self, extra):
+        needed = self.count + extra
+        capacity = len(self.pos)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("pos", "vel", "spawn_time", "ttl"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def spawn(self, x, y, angles, speed, current_time, ttl=None):
+        # Angles in degrees, same convention as pygame.Vector2.rotate
+        angles = np.radians(np.atleast_1d(np.asarray(angles, dtype=np.float32)))
+        n = len(angles)
+        self.reserve(n)
+        start, end = self.count, self.count + n
+        self.pos[start:end] = (x, y)
+        self.vel[start:end, 0] = np.cos(angles) * speed
+        self.vel[start:end, 1] = np.sin(angles) * speed
+        self.spawn_time[start:end] = current_time
+        self.ttl[start:end] = self.default_ttl if ttl is None else ttl
+        self.count = end
+
+    def spawn_ring(self, x, y, count, speed, current_time, offset=0):
+        angles = offset + np.arange(count, dtype=np.float32) * (360 / count)
+        self.spawn(x, y, angles, speed, current_time)
+
+    def update(self, dt, current_time):
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.vel[:n] * dt
+        alive = (current_time - self.spawn_time[:n]) <= self.ttl[:n]
+        if not alive.all():
+            self.compact(alive)
+
+    def compact(self, keep):
+        n = self.count
+        kept = int(np.count_nonzero(keep))
+        for arr in (self.pos, self.vel, self.spawn_time, self.ttl):
+            arr[:kept] = arr[:n][keep]
+        self.count = kept
+
+    def kill(self, indices):
+        keep = np.ones(self.count, dtype=bool)
+        keep[indices] = False
+        self.compact(keep)
+
+    def clear(self):
+        self.count = 0
+
+    def hits(self, rect):
+        # Indices of bullets whose rect overlaps the given rect
+        n = self.count
+        if n == 0:
+            return np.empty(0, dtype=np.intp)
+        left = self.pos[:n] - self.half
+        right = left + self.size
+        mask = (
+            (left[:, 0] < rect.right) & (right[:, 0] > rect.left) &
+            (left[:, 1] < rect.bottom) & (right[:, 1] > rect.top)
+        )
+        return np.flatnonzero(mask)
+
+    def screen_positions(self, camera, margin=0):
+        n = self.count
+        if n == 0:
+            return np.empty((0, 2), dtype=np.int32)
+        pts = (self.pos[:n] - self.half - (camera.offset.x, camera.offset.y)).astype(np.int32)
+        w, h = self.size
+        visible = (
+            (pts[:, 0] > -w - margin) & (pts[:, 0] < camera.width + margin) &
+            (pts[:, 1] > -h - margin) & (pts[:, 1] < camera.height + margin)
+        )
+        return pts[visible]
+
+    def draw(self, screen, camera, debug=False):
+        pts = self.screen_positions(camera).tolist()
+        if not pts:
+            return
+        image = self.image
+        screen.blits([(image, pt) for pt in pts], doreturn=False)
+        if debug:
+            for x, y in pts:
+                pygame.draw.rect(screen, (255, 0, 0), (x, y, *self.size), 1)
+
+    def lights(self, camera, limit=64):
+        if not self.light_radius:
+            return []
+        half_w, half_h = self.size[0] // 2, self.size[1] // 2
+        radius = self.light_radius
+        return [
+            ((x + half_w, y + half_h), radius)
+            for x, y in self.screen_positions(camera, margin=radius)[:limit].tolist()
+        ]
@@ -0,0 +1,51 @@
+from collections import namedtuple
+import pygame
+
+InputState = namedtuple("InputState", ["left", "right", "up", "down", "throw"])
+NO_INPUT = InputState(False, False, False, False, False)
+
+
+class KeyboardInput:
+    def poll(self):
+        keys = pygame.key.get_pressed()
+        return InputState(
+            keys[pygame.K_LEFT] or keys[pygame.K_a],
+            keys[pygame.K_RIGHT] or keys[pygame.K_d],
+            keys[pygame.K_UP] or keys[pygame.K_w],
+            keys[pygame.K_DOWN] or keys[pygame.K_s],
+            keys[pygame.K_e],
+        )
+
+
+class ScriptedInput:
+    def __init__(self, states, loop=False):
+        self.states = list(states)
+        self.loop = loop
+        self.index = 0
+
+    def poll(self):
+        if self.index >= len(self.states):
+            if not self.loop or not self.states:
+                return NO_INPUT
+            self.index = 0
+        state = self.states[self.index]
+        self.index += 1
+        return state
+
+
+class RandomWalkInput:
+    # Holds a random direction for a while, then picks another one
+    def __init__(self, rng, hold_ticks=30):
+        self.rng = rng
+        self.hold_ticks = hold_ticks
+        self.remaining = 0
+        self.state = NO_INPUT
+
+    def poll(self):
+        if self.remaining <= 0:
+            self.remaining = self.hold_ticks
+            pressed = [False] * 4
+            pressed[self.rng.randrange(4)] = True
+            self.state = InputState(*pressed, self.rng.random() < 0.2)
+        self.remaining -= 1
+        return self.state
@@ -1,19 +1,21 @@
 import pygame
-import os
 import math
 from abc import ABC, abstractmethod
+from asset_manager import asset_manager
 
 class Entity(ABC, pygame.sprite.Sprite):
     def __init__(self, x, y, sprite_folder, size):
         super().__init__()
-        self.frames = {"down": [], "up": [], "left": [], "right": []}
         self.direction = "down"
         self.current_frame = 0
         self.animation_timer = 0
         self.frame_rate = 0.1
         self.size = size
 
-        self.load_frames(sprite_folder)
+        # Shared with every other entity of this folder and size
+        self.animations = asset_manager.animation_set(sprite_folder, size)
+        self.variant = "normal"
+        self.frames = self.animations.frames()
         self.image = self.frames[self.direction][self.current_frame]
         self.rect = self.image.get_rect(topleft=(x, y))
         self.hitbox = self.rect.inflate(-40, -40)
@@ -26,14 +28,12 @@ class Entity(ABC, pygame.sprite.Sprite):
     def update(self):
         pass
     
-    def load_frames(self, folder):
-        for direction in self.frames:
-            path = os.path.join(folder, direction)
-            for filename in sorted(os.listdir(path)):
-                if filename.endswith(".png"):
-                    img = pygame.image.load(os.path.join(path, filename)).convert_alpha()
-                    img = pygame.transform.scale(img, (self.size, self.size))
-                    self.frames[direction].append(img)
+    def set_variant(self, variant):
+        # "normal", "hidden" or "flash"; a reference swap, frames are never touched
+        if variant != self.variant:
+            self.variant = variant
+            self.frames = self.animations.frames(variant)
+            self.image = self.frames[self.direction][self.current_frame]
 
     def animate(self, dt):
         self.animation_timer += dt
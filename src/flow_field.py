@@ -0,0 +1,84 @@
+import numpy as np
+from tile_grid import WALL
+
+# Flow codes: 0 means no step (the target tile, a wall or out of reach)
+STEPS = ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class FlowField:
+    # Breadth-first distances from one target tile over the walkable cells
+    # of a window around it, and for every reached cell the step that leads
+    # one tile closer. Rebuilt only when the target moves to another tile,
+    # so any number of chasers share one search and steer with a lookup.
+    def __init__(self, grid, radius=16):
+        self.grid = grid
+        self.tile_size = grid.tile_size
+        self.radius = radius
+        self.width = 2 * radius + 3  # window plus a wall border
+        self.target = None
+        self.origin = (0, 0)
+        self.flow = bytearray()
+        self.distance = np.zeros((0, 0), dtype=np.int32)
+        self.rebuilds = 0
+
+    def update(self, tile):
+        # Returns True if the field had to be rebuilt
+        if tile == self.target:
+            return False
+        self.rebuild(tile)
+        return True
+
+    def rebuild(self, tile):
+        tx, ty = tile
+        r, w = self.radius, self.width
+        self.origin = ox, oy = tx - r - 1, ty - r - 1
+
+        walkable = np.zeros((w, w), dtype=np.uint8)
+        walkable[1:-1, 1:-1] = self.grid.region(ox + 1, oy + 1, w - 2, w - 2, fill=WALL) != WALL
+        walkable = walkable.tobytes()
+
+        # A neighbour found from cell steps back towards it, the opposite way
+        links = ((1, 2), (-1, 1), (w, 4), (-w, 3))
+        start = (r + 1) * w + r + 1
+        distance = [-1] * (w * w)
+        flow = bytearray(w * w)
+        distance[start] = 0
+        queue = [start]
+        for cell in queue:
+            d = distance[cell] + 1
+            for offset, code in links:
+                neighbour = cell + offset
+                if walkable[neighbour] and distance[neighbour] < 0:
+                    distance[neighbour] = d
+                    flow[neighbour] = code
+                    queue.append(neighbour)
+
+        self.target = tile
+        self.flow = flow
+        self.distance = np.array(distance, dtype=np.int32).reshape(w, w)
+        self.rebuilds += 1
+
+    def index(self, x, y):
+        x -= self.origin[0]
+        y -= self.origin[1]
+        if 0 <= x < self.width and 0 <= y < self.width:
+            return y * self.width + x
+        return None
+
+    def step(self, x, y):
+        i = self.index(x, y)
+        return STEPS[self.flow[i]] if i is not None else STEPS[0]
+
+    def distance_at(self, x, y):
+        # Steps to the target, or -1 if (x, y) can't reach it within the window
+        i = self.index(x, y)
+        return int(self.distance.flat[i]) if i is not None else -1
+
+    def cells_between(self, nearest, farthest=None):
+        # Reachable (x, y) tiles whose distance lies in [nearest, farthest]
+        reach = self.distance >= nearest
+        if farthest is not None:
+            reach &= self.distance <= farthest
+        ys, xs = np.nonzero(reach)
+        ox, oy = self.origin
+        return list(zip((xs + ox).tolist(), (ys + oy).tolist()))
@@ -1,58 +1,107 @@
+import os
 import pygame
-from player import Player
 from camera import Camera
 from background import Background
 from menu import Menu
-from maze import Maze
-from hpbar import HPBar
-from boss_map import BossMap
 from cutscene import Cutscene
 from end_cutscene import EndCutscene
-from prolog import Prolog  # ✅ NEW IMPORT
+from prolog import Prolog
+from lighting import LightingEngine
+from static_layer import StaticLayer
+from asset_manager import asset_manager, preloader
+from audio import audio
+from atlas import load_atlas
+from presenter import presenter
+from text_cache import text_cache
+from hud import HUD
+from simulation import Simulation, RealClock
+from controls import KeyboardInput
+from replay import Recorder
+from timing import timings
+from profiling import profiler
 
 class Game:
-    def __init__(self):
+    def __init__(self, streaming=False, record_path=None, maze_seed=None, renderer=None):
+        self.STREAMING_WORLD = streaming
+        self.record_path = record_path
+        self.maze_seed = maze_seed
+        self.renderer = renderer  # None, "software" or "gpu"; see Presenter.open_window
         self.INTERNAL_WIDTH, self.INTERNAL_HEIGHT = 800, 600
         self.FPS = 60
+        self.GUARDIANS = 6
         self.MENU_MUSIC = "bgm/puzzle-game-bright-casual-video-game-music-249202.mp3"
         self.GAME_MUSIC = "bgm/background_music.mp3"
         self.BOSS_MUSIC = "bgm/boss_music.mp3"
         self.NOISES = "bgm/sfx/crowd-noise.mp3"
         self.FOOTSTEPS = "bgm/sfx/footstep.wav"
 
-    def draw_light_effect(self, surface, player_screen_pos, radius=150):
-        width, height = surface.get_size()
-        darkness = pygame.Surface((width, height), flags=pygame.SRCALPHA)
-        darkness.fill((0, 0, 0, 240))
-
-        light_mask = pygame.Surface((radius * 2, radius * 2), flags=pygame.SRCALPHA)
-        for r in range(radius, 0, -1):
-            alpha = int(255 * (1 - (r / radius)))
-            pygame.draw.circle(light_mask, (0, 0, 0, alpha), (radius, radius), r)
-
-        light_pos = (player_screen_pos[0] - radius, player_screen_pos[1] - radius)
-        darkness.blit(light_mask, light_pos, special_flags=pygame.BLEND_RGBA_SUB)
-        surface.blit(darkness, (0, 0))
+        self.MAZE_DARKNESS = 240
+        self.BOSS_DARKNESS = 100  # the arena used to be unlit; a light shade lets fireballs glow
+        self.lighting = LightingEngine((self.INTERNAL_WIDTH, self.INTERNAL_HEIGHT))
+        self.hud = None
+        self.hud_key = None
+
+        # Everything the cutscene, maze and boss fight load; decoded on a
+        # worker thread while the prolog plays. Projectiles are spawned
+        # mid-fight, so they are included to keep them off the disk too.
+        tile = (64, 64)
+        self.PRELOAD_IMAGES = [
+            ("assets/backgrounds/cutscene_background.png", (self.INTERNAL_WIDTH, self.INTERNAL_HEIGHT), "opaque"),
+            ("assets/tiles/floor.png", tile, "opaque"),
+            ("assets/tiles/wall.png", tile),
+        ] + [
+            (f"assets/tiles/spike_{i}.png", tile) for i in range(1, 5)
+        ] + [
+            (f"assets/tiles/fire_{i}.png", tile) for i in range(1, 13)
+        ] + [
+            ("assets/backgrounds/boss_background.png", (640, 640), "opaque"),
+            ("assets/projectiles/fireball.png", (12, 12)),
+            ("assets/projectiles/spear.png", (32, 32)),
+        ] + [
+            ("assets/projectiles/spear.png", (32, 32), "alpha", angle)
+            for angle in (0, 90, 180, -90)
+        ]
+        self.PRELOAD_FRAMES = [
+            (os.path.join(folder, direction), size)
+            for folder, size in (("assets/player", 96), ("assets/boss", 128), ("assets/boss", 64))
+            for direction in ("down", "up", "left", "right")
+        ]
+        self.PRELOAD_FONTS = [(None, 32, False)]  # the boss fight's spear prompt
+
+    def draw_light_effect(self, surface, player_screen_pos, radius=150, lights=(), darkness=None, fog=None):
+        self.lighting.add_light(player_screen_pos, radius)
+        for pos, light_radius in lights:
+            self.lighting.add_light(pos, light_radius, "quadratic")
+        self.lighting.render(surface, self.MAZE_DARKNESS if darkness is None else darkness, fog)
 
     def run(self):
         pygame.init()
-        display_surface = pygame.display.set_mode((self.INTERNAL_WIDTH, self.INTERNAL_HEIGHT), pygame.RESIZABLE)
-        pygame.display.set_caption("Out of Angkorwat")
-        clock = pygame.time.Clock()
-        ikon = pygame.image.load("icon.png")
-        pygame.display.set_icon(ikon)
+        ikon = asset_manager.image("icon.png", mode=None)
+        display_surface = presenter.open_window("Out of Angkorwat", ikon, self.renderer)
+        clock = RealClock()
 
-        pygame.mixer.music.load(self.MENU_MUSIC)
-        pygame.mixer.music.play(-1)
-        pygame.mixer.music.set_volume(0.5)
+        # Pre-scaled sprites from the atlas cache, rebuilt if any PNG changed
+        try:
+            asset_manager.use_atlas(load_atlas())
+        except (OSError, ValueError) as e:
+            print(f"[Error] Failed to load atlas cache, using PNGs: {e}")
+
+        # Decode every track in the background; the menu music starts as
+        # soon as its own decode is done
+        audio.prefetch(self.MENU_MUSIC, self.NOISES, self.FOOTSTEPS, self.GAME_MUSIC, self.BOSS_MUSIC)
+        audio.play(self.MENU_MUSIC)
 
         while True:
             menu = Menu(display_surface)
-            menu_result = menu.run()
+            with profiler.scene("menu"):
+                menu_result = menu.run()
             if menu_result == "quit":
                 pygame.quit()
                 return
 
+            preloader.start(images=self.PRELOAD_IMAGES, frames=self.PRELOAD_FRAMES, sounds=[self.FOOTSTEPS],
+                            fonts=self.PRELOAD_FONTS)
+
             prolog_dialogue = [
                 "Suatu hari, di perjalanan wisata sekolah...",
                 "Guru: Anak-anak, kita sudah sampai di Angkorwat, silahkan turun...",
@@ -61,184 +110,186 @@ class Game:
                 "Leyberg: *dalam hati* Lagian emang kenapa sih kalau masuk? Ada Golem?",
                 "Leyberg: *dalam hati* Gak mungkin lah! Bodo ah, masuk aja!"
             ]
-            pygame.mixer.music.stop()
             # Show prolog first
-            pygame.mixer.music.load(self.NOISES)
-            pygame.mixer.music.play(-1)
-            Prolog(display_surface, prolog_dialogue, "intro_background.png").run()
+            audio.play(self.NOISES)
+            with profiler.scene("prolog"):
+                Prolog(display_surface, prolog_dialogue, "intro_background.png").run()
 
             def start_game_after_cutscene():
-                pygame.mixer.music.stop()
-                pygame.mixer.music.load(self.GAME_MUSIC)
-                pygame.mixer.music.play(-1)
+                audio.play(self.GAME_MUSIC)
 
-            pygame.mixer.music.stop()
-            pygame.mixer.music.load(self.FOOTSTEPS)
-            pygame.mixer.music.play(-1)
-            Cutscene(display_surface, start_game_after_cutscene).run()
+            audio.play(self.FOOTSTEPS)
+            with profiler.scene("cutscene"):
+                Cutscene(display_surface, start_game_after_cutscene).run()
+            preloader.finish()  # usually done already; blocks only on a slow disk
 
             internal_surface = pygame.Surface((self.INTERNAL_WIDTH, self.INTERNAL_HEIGHT))
 
-            all_sprites = pygame.sprite.Group()
-            background_group = pygame.sprite.Group()
+            controls, sim_clock = KeyboardInput(), clock
+            recorder = None
+            if self.record_path:
+                # Log input and frame times so the run can be replayed exactly
+                recorder = Recorder(controls, clock)
+                controls = sim_clock = recorder
 
-            background = Background("assets/tiles/floor.png", 1600, 1600, 64)
-            background_group.add(background)
-
-            player = Player(50, 50)
-            all_sprites.add(player)
-
-            hp_bar = HPBar(10, 10)
-            collidable_objects = pygame.sprite.Group()
-            spikes = pygame.sprite.Group()
-            fires = pygame.sprite.Group()
+            sim = Simulation(controls=controls, clock=sim_clock, fps=self.FPS, streaming=self.STREAMING_WORLD,
+                             guardians=self.GUARDIANS, maze_seed=self.maze_seed)
+            player = sim.player
             camera = Camera(self.INTERNAL_WIDTH, self.INTERNAL_HEIGHT)
-
-            tile_size = 64
-            wall_img = pygame.image.load("assets/tiles/wall.png").convert_alpha()
-            wall_img = pygame.transform.scale(wall_img, (tile_size, tile_size))
-
-            maze = Maze(25, 25, tile_size, wall_img)
-            collidable_objects, spikes, fires, exit_rect = maze.create_walls()
-
-            in_boss_fight = False
-            boss_map = None
-            player_projectiles = pygame.sprite.Group()
+            static_layer = self.build_static_layer(sim)
 
             running = True
+            presenter.invalidate()
+            profiler.enter_scene("maze")
             while running:
-                dt = clock.tick(self.FPS) / 1000
-                current_time = pygame.time.get_ticks()
-
-                for event in pygame.event.get():
+                with timings.probe("events"):
+                    events = pygame.event.get()
+                for event in events:
                     if event.type == pygame.QUIT:
+                        if recorder:
+                            recorder.save(self.record_path, sim)
                         pygame.quit()
                         return
-
-                if not in_boss_fight:
-                    player.update(dt, collidable_objects)
-
-                    for spike in spikes:
-                        spike.update(current_time)
-                    for fire in fires:
-                        fire.update(current_time)
-
-                    for spike in pygame.sprite.spritecollide(player, spikes, False, collided=lambda s1, s2: s1.hitbox.colliderect(s2.rect)):
-                        if spike.is_active():
-                            player.take_damage(10, current_time, hp_bar)
-
-                    for fire in pygame.sprite.spritecollide(player, fires, False, collided=lambda s1, s2: s1.hitbox.colliderect(s2.rect)):
-                        if fire.is_active():
-                            player.take_damage(20, current_time, hp_bar)
-
-                    if player.health <= 0:
-                        self.display_end_text(internal_surface, display_surface, "Game Over!", (255, 0, 0))
-                        player.footsteep_sound.stop()
-                        break
-
-                    if player.rect.left > exit_rect.right:
-                        in_boss_fight = True
-                        player.rect.topleft = (50, 50)
-                        player.hitbox.topleft = (player.rect.left + 40, player.rect.top + 32)
-                        camera = Camera(self.INTERNAL_WIDTH, self.INTERNAL_HEIGHT)
-                        boss_map = BossMap()
-                        collidable_objects.empty()
-                        spikes.empty()
-                        fires.empty()
-                        all_sprites.empty()
-                        all_sprites.add(player)
-
-                        pygame.mixer.music.stop()
-                        pygame.mixer.music.load(self.BOSS_MUSIC)
-                        pygame.mixer.music.play(-1)
-                        continue
-
-                    camera.update(player)
-                    internal_surface.fill((30, 30, 30))
-
-                    for bg in background_group:
-                        internal_surface.blit(bg.image, camera.apply(bg))
-                    for wall in collidable_objects:
-                        internal_surface.blit(wall.image, camera.apply(wall))
-                    for spike in spikes:
-                        spike.draw(internal_surface, camera.apply(spike).topleft)
-                    for fire in fires:
-                        fire.draw(internal_surface, camera.apply(fire).topleft)
-                    for sprite in all_sprites:
-                        internal_surface.blit(sprite.image, camera.apply(sprite))
-
-                    player_screen_pos = camera.apply(player).center
-                    self.draw_light_effect(internal_surface, player_screen_pos, radius=150)
-                    hp_bar.draw(internal_surface)
-                else:
-                    player.update(dt, pygame.sprite.Group())
-                    player_projectiles.update(dt)
-                    boss_map.update(dt, current_time, player, hp_bar, player_projectiles)
-                    camera.update(player)
-
-                    internal_surface.fill((0, 0, 0))
-                    boss_map.draw(internal_surface, camera, player)
-
-                    for proj in player_projectiles:
-                        internal_surface.blit(proj.image, camera.apply(proj))
-
-                    internal_surface.blit(player.image, camera.apply(player))
-                    hp_bar.draw(internal_surface)
-
-                    if player.health <= 0:
-                        self.display_end_text(internal_surface, display_surface, "Game Over!", (255, 0, 0))
-                        player.footsteep_sound.stop()
-                        break
-
-                    if not boss_map.boss.alive:
-                        player.footsteep_sound.stop()
-
-                        # Show victory message
-                        self.display_end_text(
-                            internal_surface,
-                            display_surface,
-                            "You Win!\nYou've Defeated Goru",
-                            (0, 255, 0)
-                        )
-
-                        def return_to_menu():
-                            pygame.mixer.music.stop()
-                            pygame.mixer.music.load(self.MENU_MUSIC)
-                            pygame.mixer.music.play(-1)
-
-                        pygame.mixer.music.stop()
-                        pygame.mixer.music.load(self.FOOTSTEPS)
-                        pygame.mixer.music.play(-1)
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                        timings.toggle_overlay()
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                        profiler.request()
+                    presenter.handle_event(event)
+
+                outcome = sim.step()
+                if recorder and outcome in ("dead", "victory"):
+                    recorder.save(self.record_path, sim)
+
+                if outcome == "dead":
+                    self.display_end_text(internal_surface, display_surface, "Game Over!", (255, 0, 0))
+                    player.stop_footsteps()
+                    profiler.leave_scene()
+                    break
+
+                if outcome == "boss":
+                    camera = Camera(self.INTERNAL_WIDTH, self.INTERNAL_HEIGHT)
+                    audio.play(self.BOSS_MUSIC)
+                    profiler.enter_scene("boss")
+                    continue
+
+                if outcome == "victory":
+                    player.stop_footsteps()
+
+                    # Show victory message
+                    self.display_end_text(
+                        internal_surface,
+                        display_surface,
+                        "You Win!\nYou've Defeated Goru",
+                        (0, 255, 0)
+                    )
+
+                    def return_to_menu():
+                        audio.play(self.MENU_MUSIC)
+
+                    audio.play(self.FOOTSTEPS)
+                    with profiler.scene("end_cutscene"):
                         EndCutscene(display_surface, return_to_menu).run()
-                        break
-
+                    break
 
-                self.scale_and_blit(display_surface, internal_surface)
+                camera.update(player)
+                if sim.phase == "maze":
+                    self.draw_maze_scene(internal_surface, sim, camera, static_layer)
+                else:
+                    self.draw_boss_scene(internal_surface, sim, camera)
+                timings.draw_overlay(internal_surface)
+
+                with timings.probe("present"):
+                    self.scale_and_blit(display_surface, internal_surface)
+                timings.add("audio", audio.end_frame() / 1000)
+                timings.end_frame()
+                profiler.end_frame()
+
+    def build_static_layer(self, sim):
+        if sim.world:
+            return sim.world  # streams and bakes its own chunks
+        # Floor and walls never change, so bake them once into chunks
+        cols, rows = sim.settings["maze_size"]
+        tile_size = sim.settings["tile_size"]
+        background = Background("assets/tiles/floor.png", cols * tile_size, rows * tile_size, tile_size)
+        static_layer = StaticLayer(background.rect.width, background.rect.height, fill=(30, 30, 30))
+        static_layer.add(background.image, background.rect.topleft)
+        for wall in sim.walls:
+            static_layer.add(wall.image, wall.rect.topleft)
+        return static_layer
+
+    def draw_maze_scene(self, surface, sim, camera, static_layer):
+        player = sim.player
+        with timings.probe("draw.world"):
+            surface.fill((30, 30, 30))
+            static_layer.draw(surface, camera)
+            sim.traps.draw(surface, camera, sim.current_time)
+            self.draw_guardians(surface, sim.guardians, camera)
+            surface.blit(player.image, camera.apply(player))
+
+        with timings.probe("draw.lighting"):
+            player_screen_pos = camera.apply(player).center
+            fire_lights = sim.traps.lights(camera, sim.current_time)
+            # Walls block the light: tiles out of sight stay dark, unexplored ones black
+            fog = sim.visibility.fog(camera, surface.get_size(), self.MAZE_DARKNESS)
+            self.draw_light_effect(surface, player_screen_pos, radius=150, lights=fire_lights, fog=fog)
+        with timings.probe("draw.hud"):
+            self.get_hud(sim).draw(surface, camera)
+
+    def draw_guardians(self, surface, guardians, camera):
+        view = surface.get_rect()
+        blits = []
+        for guardian in guardians:
+            rect = camera.apply(guardian)
+            if rect.colliderect(view):
+                blits.append((guardian.image, rect))
+        surface.blits(blits, doreturn=False)
+
+    def draw_boss_scene(self, surface, sim, camera):
+        player = sim.player
+        boss_map = sim.boss_map
+        with timings.probe("draw.world"):
+            surface.fill((0, 0, 0))
+            boss_map.draw(surface, camera, player)
+
+            for proj in sim.player_projectiles:
+                surface.blit(proj.image, camera.apply(proj))
+
+            surface.blit(player.image, camera.apply(player))
+        with timings.probe("draw.lighting"):
+            self.draw_light_effect(
+                surface,
+                camera.apply(player).center,
+                radius=200,
+                lights=boss_map.boss.projectiles.lights(camera),
+                darkness=self.BOSS_DARKNESS
+            )
+        with timings.probe("draw.hud"):
+            self.get_hud(sim).draw(surface, camera)
+
+    def get_hud(self, sim):
+        # Widgets keep their rendered surfaces, so the HUD is only rebuilt
+        # when the simulation or its phase changes
+        key = (sim, sim.phase)
+        if key != self.hud_key:
+            widgets = [sim.hp_bar]
+            if sim.boss_map:
+                widgets += sim.boss_map.hud_widgets(sim.player)
+            self.hud = HUD(widgets)
+            self.hud_key = key
+        return self.hud
 
     def display_end_text(self, surface, display_surface, text, color):
-        font = pygame.font.SysFont(None, 48)
+        font = text_cache.font(None, 48)
         lines = text.split("\n")
         surface.fill((0, 0, 0))  # Clear the screen
 
         for i, line in enumerate(lines):
-            message = font.render(line, True, color)
+            message = text_cache.render(font, line, color)
             text_rect = message.get_rect(center=(self.INTERNAL_WIDTH // 2, self.INTERNAL_HEIGHT // 2 + i * 50))
             surface.blit(message, text_rect)
 
-        scaled = pygame.transform.scale(surface, display_surface.get_size())
-        display_surface.blit(scaled, (0, 0))
-        pygame.display.flip()
+        presenter.present(display_surface, surface)
         pygame.time.wait(2500)
 
     def scale_and_blit(self, display_surface, internal_surface):
-        win_w, win_h = display_surface.get_size()
-        scale = min(win_w / self.INTERNAL_WIDTH, win_h / self.INTERNAL_HEIGHT)
-        scaled_w = int(self.INTERNAL_WIDTH * scale)
-        scaled_h = int(self.INTERNAL_HEIGHT * scale)
-        x_offset = (win_w - scaled_w) // 2
-        y_offset = (win_h - scaled_h) // 2
-
-        scaled_surface = pygame.transform.scale(internal_surface, (scaled_w, scaled_h))
-        display_surface.fill((0, 0, 0))
-        display_surface.blit(scaled_surface, (x_offset, y_offset))
-        pygame.display.flip()
+        presenter.present(display_surface, internal_surface)
@@ -1,5 +1,8 @@
 import pygame
 from abc import ABC, abstractmethod
+from asset_manager import asset_manager, preloader
+from presenter import presenter
+from profiling import profiler
 
 class GameCutscene(ABC):
     def __init__(self, surface, on_complete):
@@ -10,8 +13,11 @@ class GameCutscene(ABC):
         self.clock = pygame.time.Clock()
 
         # Load background
-        self.background = pygame.image.load("assets/backgrounds/cutscene_background.png").convert()
-        self.background = pygame.transform.scale(self.background, (self.INTERNAL_WIDTH, self.INTERNAL_HEIGHT))
+        self.background = asset_manager.image(
+            "assets/backgrounds/cutscene_background.png",
+            (self.INTERNAL_WIDTH, self.INTERNAL_HEIGHT),
+            "opaque"
+        )
 
         self.frames = []
         self.current_frame = 0
@@ -49,9 +55,7 @@ class GameCutscene(ABC):
         i = 0
         while True:
             try:
-                img = pygame.image.load(f"{path}/{i}.png").convert_alpha()
-                img = pygame.transform.scale(img, (96, 96))
-                self.frames.append(img)
+                self.frames.append(asset_manager.image(f"{path}/{i}.png", (96, 96)))
                 i += 1
             except FileNotFoundError:
                 break
@@ -60,10 +64,16 @@ class GameCutscene(ABC):
 
     def run(self):
         running = True
+        self.internal_surface.blit(self.background, (0, 0))
+        last_rect = None
+        presenter.invalidate()
         while running:
             dt = self.clock.tick(60) / 1000
+            profiler.end_frame()
+            preloader.pump()
 
             for event in pygame.event.get():
+                presenter.handle_event(event)
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     exit()
@@ -80,19 +90,10 @@ class GameCutscene(ABC):
                 self.frame_timer = 0
                 self.current_frame = (self.current_frame + 1) % len(self.frames)
 
-            # Draw
-            self.internal_surface.blit(self.background, (0, 0))
-            self.internal_surface.blit(self.frames[self.current_frame], (self.x, self.y))
-
-            # Scale for display
-            win_w, win_h = self.display_surface.get_size()
-            scale = min(win_w / self.INTERNAL_WIDTH, win_h / self.INTERNAL_HEIGHT)
-            scaled_w = int(self.INTERNAL_WIDTH * scale)
-            scaled_h = int(self.INTERNAL_HEIGHT * scale)
-            x_offset = (win_w - scaled_w) // 2
-            y_offset = (win_h - scaled_h) // 2
-
-            scaled_surface = pygame.transform.scale(self.internal_surface, (scaled_w, scaled_h))
-            self.display_surface.fill((0, 0, 0))
-            self.display_surface.blit(scaled_surface, (x_offset, y_offset))
-            pygame.display.flip()
+            # Draw: only the character moves, so restore the background under
+            # its previous position and present just the two rects
+            if last_rect is not None:
+                self.internal_surface.blit(self.background, last_rect, last_rect)
+            rect = self.internal_surface.blit(self.frames[self.current_frame], (self.x, self.y))
+            presenter.present(self.display_surface, self.internal_surface, [last_rect or rect, rect])
+            last_rect = rect
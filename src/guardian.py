@@ -0,0 +1,59 @@
+import math
+import pygame
+from entity import Entity
+
+
+class Guardian(Entity):
+    # A small temple golem that follows the shared flow field to the player
+    def __init__(self, x, y, speed=120, damage=10):
+        super().__init__(x, y, "assets/boss", 64)
+        self.hitbox = self.rect.inflate(-32, -32)
+        self.pos = pygame.Vector2(self.hitbox.center)
+        self.speed = speed
+        self.damage = damage
+        self.frame_rate = 0.15
+
+    def update(self, dt, field, player, current_time, hp_bar):
+        size = field.tile_size
+        x, y = int(self.pos.x) // size, int(self.pos.y) // size
+        cx, cy = x * size + size // 2, y * size + size // 2
+        dx, dy = field.step(x, y)
+        # Waypoints along the corridor axes only: first onto the centre line
+        # of the current tile, then on to the next tile's centre, so the
+        # sprite never cuts a wall corner on a turn
+        if dx:
+            waypoints = [(self.pos.x, cy), (cx + dx * size, cy)]
+        elif dy:
+            waypoints = [(cx, self.pos.y), (cx, cy + dy * size)]
+        elif field.target == (x, y):
+            # Same tile as the player: close in, but stay inside the tile
+            slack = (size - self.hitbox.width) // 2
+            px, py = player.hitbox.center
+            waypoints = [(min(max(px, cx - slack), cx + slack), min(max(py, cy - slack), cy + slack))]
+        else:
+            waypoints = []  # out of reach; wait
+
+        budget = self.speed * dt
+        moved = False
+        for tx, ty in waypoints:
+            vx, vy = tx - self.pos.x, ty - self.pos.y
+            length = math.hypot(vx, vy)
+            if length < 0.5:
+                continue
+            move = min(budget, length)
+            self.pos.x += vx * move / length
+            self.pos.y += vy * move / length
+            budget -= move
+            if abs(vx) > abs(vy):
+                self.direction = "right" if vx > 0 else "left"
+            else:
+                self.direction = "down" if vy > 0 else "up"
+            moved = True
+            if budget <= 0:
+                break
+        if moved:
+            self.hitbox.center = self.rect.center = (round(self.pos.x), round(self.pos.y))
+            self.animate(dt)
+
+        if self.hitbox.colliderect(player.hitbox):
+            player.take_damage(self.damage, current_time, hp_bar)
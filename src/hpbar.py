@@ -1,7 +1,10 @@
 import pygame
+from text_cache import text_cache
+from hud import Widget
 
-class HPBar:
+class HPBar(Widget):
     def __init__(self, x, y, width=200, height=20, max_hp=100):
+        super().__init__()
         self.x = x
         self.y = y
         self.width = width
@@ -9,7 +12,7 @@ class HPBar:
         self.max_hp = max_hp
         self.current_hp = max_hp
         self.border_radius = 10
-        self.font = pygame.font.SysFont(None, 24)
+        self.font = text_cache.font(None, 24)
 
     def reduce(self, amount):
         self.current_hp = max(0, self.current_hp - amount)
@@ -17,17 +20,27 @@ class HPBar:
     def heal(self, amount):
         self.current_hp = min(self.max_hp, self.current_hp + amount)
 
-    def get_color(self):
-        ratio = self.current_hp / self.max_hp
+    def get_color(self, hp=None):
+        ratio = (self.current_hp if hp is None else hp) / self.max_hp
         if ratio > 0.6: return (0, 200, 0)      # Hijau
         elif ratio > 0.3: return (255, 215, 0)  # Kuning
         else: return (200, 0, 0)               # Merah
 
-    def draw(self, surface):
-        fill_width = (self.current_hp / self.max_hp) * self.width
-        pygame.draw.rect(surface, (0, 0, 0), (self.x-2, self.y-2, self.width+4, self.height+4), border_radius=self.border_radius+2)
-        pygame.draw.rect(surface, (255, 255, 255), (self.x, self.y, self.width, self.height), border_radius=self.border_radius)
-        pygame.draw.rect(surface, self.get_color(), (self.x, self.y, fill_width, self.height), border_radius=self.border_radius)
+    def state(self):
+        return self.current_hp
 
-        text = self.font.render(f"HP: {int(self.current_hp)} / {self.max_hp}", True, (255, 255, 255))
-        surface.blit(text, (self.x, self.y + self.height + 5))
\ No newline at end of file
+    def render(self, hp):
+        # Drawn relative to (x - 2, y - 2), the corner of the black border
+        text = text_cache.render(self.font, f"HP: {int(hp)} / {self.max_hp}", (255, 255, 255))
+        size = (max(self.width + 4, text.get_width() + 2), self.height + 7 + text.get_height())
+        image = pygame.Surface(size, pygame.SRCALPHA)
+
+        fill_width = (hp / self.max_hp) * self.width
+        pygame.draw.rect(image, (0, 0, 0), (0, 0, self.width+4, self.height+4), border_radius=self.border_radius+2)
+        pygame.draw.rect(image, (255, 255, 255), (2, 2, self.width, self.height), border_radius=self.border_radius)
+        pygame.draw.rect(image, self.get_color(hp), (2, 2, fill_width, self.height), border_radius=self.border_radius)
+        image.blit(text, (2, self.height + 7))
+        return image
+
+    def position(self, surface, camera):
+        return (self.x - 2, self.y - 2)
\ No newline at end of file
@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+
+
+class Widget(ABC):
+    # A HUD element that keeps its last rendered surface. state() returns a
+    # hashable snapshot of what the widget shows (None hides it); the surface
+    # is only rebuilt by render() when that snapshot changes.
+    def __init__(self):
+        self.cached_state = None
+        self.cached_image = None
+
+    @abstractmethod
+    def state(self):
+        pass
+
+    @abstractmethod
+    def render(self, state):
+        pass
+
+    @abstractmethod
+    def position(self, surface, camera):
+        pass
+
+    def get_image(self):
+        state = self.state()
+        if state is None:
+            return None
+        if self.cached_image is None or state != self.cached_state:
+            self.cached_image = self.render(state)
+            self.cached_state = state
+        return self.cached_image
+
+    def draw(self, surface, camera=None):
+        image = self.get_image()
+        if image is not None:
+            surface.blit(image, self.position(surface, camera))
+
+
+class HUD:
+    def __init__(self, widgets=()):
+        self.widgets = list(widgets)
+
+    def add(self, widget):
+        self.widgets.append(widget)
+
+    def draw(self, surface, camera=None):
+        # Composite every visible widget in a single blits() call
+        blits = []
+        for widget in self.widgets:
+            image = widget.get_image()
+            if image is not None:
+                blits.append((image, widget.position(surface, camera)))
+        surface.blits(blits, doreturn=False)
@@ -0,0 +1,67 @@
+import pygame
+
+# Light intensity at normalized distance t (0 = center, 1 = edge)
+FALLOFFS = {
+    "linear": lambda t: 1 - t,
+    "quadratic": lambda t: (1 - t) ** 2,
+    "smooth": lambda t: 1 - t * t * (3 - 2 * t),
+}
+
+
+class LightingEngine:
+    def __init__(self, size, max_lights=64):
+        self.max_lights = max_lights
+        self.darkness = pygame.Surface(size, flags=pygame.SRCALPHA)
+        self.masks = {}
+        self.lights = []
+
+    def get_mask(self, radius, falloff="linear"):
+        key = (radius, falloff)
+        mask = self.masks.get(key)
+        if mask is None:
+            curve = FALLOFFS[falloff]
+            mask = pygame.Surface((radius * 2, radius * 2), flags=pygame.SRCALPHA)
+            for r in range(radius, 0, -1):
+                alpha = int(255 * curve(r / radius))
+                pygame.draw.circle(mask, (0, 0, 0, alpha), (radius, radius), r)
+            self.masks[key] = mask
+        return mask
+
+    def add_light(self, pos, radius, falloff="linear"):
+        self.lights.append((int(pos[0]), int(pos[1]), int(radius), falloff))
+
+    def render(self, surface, darkness=240, fog=None):
+        # fog: (base, mask, pos) from Visibility.fog(). The frame starts from
+        # base instead of a flat fill, and mask is max-blended back only
+        # where lights were subtracted, so light never shows what is hidden.
+        if self.darkness.get_size() != surface.get_size():
+            self.darkness = pygame.Surface(surface.get_size(), flags=pygame.SRCALPHA)
+
+        lights = self.lights
+        self.lights = []
+        if darkness <= 0:
+            return
+
+        screen_rect = self.darkness.get_rect()
+        fog_base, fog_mask, (fx, fy) = fog or (None, None, (0, 0))
+        if fog is None or not fog_base.get_rect(topleft=(fx, fy)).contains(screen_rect):
+            self.darkness.fill((0, 0, 0, darkness))
+        if fog is not None:
+            self.darkness.blit(fog_base, (fx, fy))
+        lit = []
+        drawn = 0
+        for x, y, radius, falloff in lights:
+            if drawn >= self.max_lights:
+                break
+            light_rect = pygame.Rect(x - radius, y - radius, radius * 2, radius * 2)
+            if not screen_rect.colliderect(light_rect):
+                continue
+            mask = self.get_mask(radius, falloff)
+            self.darkness.blit(mask, light_rect.topleft, special_flags=pygame.BLEND_RGBA_SUB)
+            lit.append(light_rect)
+            drawn += 1
+
+        if fog is not None:
+            for rect in lit:
+                self.darkness.blit(fog_mask, rect.topleft, rect.move(-fx, -fy), special_flags=pygame.BLEND_RGBA_MAX)
+        surface.blit(self.darkness, (0, 0))
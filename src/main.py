@@ -1,5 +1,32 @@
+import sys
 from game import Game
+from timing import timings
+from profiling import profiler
+from audio import audio
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
\ No newline at end of file
+    # --stream plays an unbounded maze that is generated as you explore
+    # --record FILE logs the run for `python src/replay.py FILE`
+    # --maze-seed N plays a seed picked with `python src/maze_batch.py query`
+    record_path = sys.argv[sys.argv.index("--record") + 1] if "--record" in sys.argv else None
+    maze_seed = int(sys.argv[sys.argv.index("--maze-seed") + 1]) if "--maze-seed" in sys.argv else None
+    # --renderer software|gpu presents through an SDL2 Renderer instead of
+    # scaling surfaces, falling back to surfaces if it can't be created
+    renderer = sys.argv[sys.argv.index("--renderer") + 1] if "--renderer" in sys.argv else None
+    game = Game(streaming="--stream" in sys.argv, record_path=record_path, maze_seed=maze_seed, renderer=renderer)
+
+    # --timings FILE.json|FILE.csv collects per-subsystem frame times and
+    # writes p50/p95/p99 on exit; F3 shows the overlay either way
+    timings_path = sys.argv[sys.argv.index("--timings") + 1] if "--timings" in sys.argv else None
+    if timings_path:
+        timings.enable()
+
+    # OOA_PROFILE=menu,prolog,cutscene,maze,boss (or all) profiles those
+    # scenes into ./profiles; F4 in game captures the next frames instead
+    try:
+        game.run()
+    finally:
+        profiler.leave_scene()  # flush a capture cut short by quitting
+    if timings_path:
+        timings.export(timings_path)
+        print(f"Timings written to {timings_path}; audio: {audio.stats()}")
\ No newline at end of file
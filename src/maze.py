@@ -1,107 +1,137 @@
+import itertools
 import random
+import numpy as np
 import pygame
-from object import Object, AnimatedObject
+from object import Object
+from tile_grid import TileGrid, SPIKE, FIRE
+from traps import TrapField, default_trap_kinds
 
 CELL_SIZE = 64
 
+# The four neighbour directions in every order, indexed by a random byte per cell
+DIRECTION_ORDERS = list(itertools.permutations(range(4)))
+
+
+def carve_passages(maze, gen):
+    # Iterative recursive-backtracker over the odd cells, starting at (1, 1).
+    # Each cell tries its neighbours in a random order, which picks uniformly
+    # among the unvisited ones like random.choice did, but checks each
+    # direction only once per cell.
+    rows, cols = maze.shape
+    width, height = cols // 2, rows // 2
+    if width == 0 or height == 0:
+        return
+    stride = width + 2
+    visited = np.ones((height + 2, stride), dtype=np.uint8)
+    visited[1:-1, 1:-1] = 0
+    visited = bytearray(visited.tobytes())
+
+    steps = (1, -1, stride, -stride)
+    orders = [tuple(steps[d] for d in order) for order in DIRECTION_ORDERS]
+    order_of = gen.integers(0, len(orders), size=len(visited)).tolist()
+    tried = bytearray(len(visited))
+
+    start = stride + 1
+    visited[start] = 1
+    stack = [start]
+    parents, children = [], []
+    while stack:
+        cell = stack[-1]
+        k = tried[cell]
+        if k == 4:
+            stack.pop()
+            continue
+        tried[cell] = k + 1
+        neighbour = cell + orders[order_of[cell]][k]
+        if not visited[neighbour]:
+            visited[neighbour] = 1
+            parents.append(cell)
+            children.append(neighbour)
+            stack.append(neighbour)
+
+    # Padded cell index -> maze coordinates
+    maze[1:2 * height:2, 1:2 * width:2] = 0
+    parents = np.array(parents, dtype=np.int64)
+    children = np.array(children, dtype=np.int64)
+    py, px = np.divmod(parents, stride)
+    cy, cx = np.divmod(children, stride)
+    maze[py + cy - 1, px + cx - 1] = 0
+
+
+def generate_cells(cols, rows, seed):
+    # Grid of uint8 cells: 0 path, 1 wall, 2 spike, 3 fire, and the exit
+    # cell (x, y) or None. Pure NumPy, so it runs without pygame or a display.
+    gen = np.random.default_rng(seed)
+
+    maze = np.ones((rows, cols), dtype=np.uint8)
+    carve_passages(maze, gen)
+
+    # Create an exit on the right wall
+    options = np.arange(1, rows - 1)
+    right_edge_options = options[(maze[1:-1, cols - 2] == 0) & (maze[1:-1, cols - 1] == 1)]
+    exit_cell = None
+    if len(right_edge_options):
+        ey, ex = int(gen.choice(right_edge_options)), cols - 1
+        maze[ey, ex] = 0  # Open the wall at the right edge
+        exit_cell = (ex, ey)
+
+    # Obstacles, never on the player's start (1,1) or on the exit
+    path_cells = np.flatnonzero(maze == 0)
+    blocked = [1 * cols + 1] + ([exit_cell[1] * cols + exit_cell[0]] if exit_cell else [])
+    path_cells = gen.permutation(path_cells[~np.isin(path_cells, blocked)])
+
+    num_spikes = int(len(path_cells) * 0.05)
+    num_fires = int((len(path_cells) - num_spikes) * 0.03)
+    flat = maze.reshape(-1)
+    flat[path_cells[:num_spikes]] = SPIKE
+    flat[path_cells[num_spikes:num_spikes + num_fires]] = FIRE
+
+    return maze, exit_cell
+
+
 class Maze:
-    def __init__(self, cols, rows, tile_size, wall_img):
+    def __init__(self, cols, rows, tile_size, wall_img, rng=None):
+        self.rng = rng or random
         self.cols = cols
         self.rows = rows
         self.tile_size = tile_size
         self.wall_img = wall_img
 
-        self.spike_imgs = [
-            pygame.transform.scale(pygame.image.load(f"assets/tiles/spike_{i}.png").convert_alpha(), (tile_size, tile_size))
-            for i in range(1, 5)
-        ]
-
-        self.fire_imgs = [
-            pygame.transform.scale(pygame.image.load(f"assets/tiles/fire_{i}.png").convert_alpha(), (tile_size, tile_size))
-            for i in range(1, 13)
-        ]
-
-    def generate_maze(self):
-        maze = [[1 for _ in range(self.cols)] for _ in range(self.rows)]
-        stack = [(1, 1)]
-        visited = set(stack)
-
-        while stack:
-            x, y = stack[-1]
-            maze[y][x] = 0
-            neighbors = []
-            for dx, dy in [(-2, 0), (2, 0), (0, -2), (0, 2)]:
-                nx, ny = x + dx, y + dy
-                if 0 < nx < self.cols and 0 < ny < self.rows and (nx, ny) not in visited:
-                    neighbors.append((nx, ny))
-
-            if neighbors:
-                nx, ny = random.choice(neighbors)
-                maze[(y + ny) // 2][(x + nx) // 2] = 0
-                visited.add((nx, ny))
-                stack.append((nx, ny))
-            else:
-                stack.pop()
-
-        # Create an exit on the right wall
-        right_edge_options = []
-        for y in range(1, self.rows - 1):
-            if maze[y][self.cols - 2] == 0 and maze[y][self.cols - 1] == 1:
-                right_edge_options.append((y, self.cols - 1))
-
-        if right_edge_options:
-            ey, ex = random.choice(right_edge_options)
-            maze[ey][ex] = 0  # Open the wall at the right edge
-            self.exit_pos = (ex * self.tile_size, ey * self.tile_size)
+        self.trap_kinds = None  # trap images, loaded by the first create_walls()
+
+        self.grid = None
+
+    def generate_maze(self, seed=None):
+        if seed is None:
+            seed = self.rng.getrandbits(63)
+        self.seed = seed
+        maze, exit_cell = generate_cells(self.cols, self.rows, seed)
+        if exit_cell:
+            self.exit_pos = (exit_cell[0] * self.tile_size, exit_cell[1] * self.tile_size)
         else:
             # Fallback if no exit found
             self.exit_pos = (self.tile_size, self.tile_size)
-
-        # Obstacles
-        path_cells = [(y, x) for y in range(self.rows) for x in range(self.cols) if maze[y][x] == 0]
-
-        # Prevent traps at the player's start (1,1)
-        if (1, 1) in path_cells:
-            path_cells.remove((1, 1))
-
-        # Prevent trap at exit
-        if 'ey' in locals() and (ey, ex) in path_cells:
-            path_cells.remove((ey, ex))
-
-        num_spikes = int(len(path_cells) * 0.05)
-        for _ in range(num_spikes):
-            if path_cells:
-                y, x = random.choice(path_cells)
-                maze[y][x] = 2
-                path_cells.remove((y, x))
-
-        num_fires = int(len(path_cells) * 0.03)
-        for _ in range(num_fires):
-            if path_cells:
-                y, x = random.choice(path_cells)
-                maze[y][x] = 3
-                path_cells.remove((y, x))
-
         return maze
 
-    def create_walls(self):
+    def create_walls(self, start_time=None, seed=None):
+        if start_time is None:
+            start_time = pygame.time.get_ticks()
+        if self.trap_kinds is None:
+            self.trap_kinds = default_trap_kinds(self.tile_size)
         walls = pygame.sprite.Group()
-        spikes = pygame.sprite.Group()
-        fires = pygame.sprite.Group()
-        maze = self.generate_maze()
-
-        for y, row in enumerate(maze):
-            for x, cell in enumerate(row):
-                pos = (x * self.tile_size, y * self.tile_size)
-                if cell == 1:
-                    wall = Object(*pos, self.wall_img)
-                    walls.add(wall)
-                elif cell == 2:
-                    spike = AnimatedObject(*pos, self.spike_imgs)
-                    spikes.add(spike)
-                elif cell == 3:
-                    fire = AnimatedObject(*pos, self.fire_imgs)
-                    fires.add(fire)
+        maze = self.generate_maze(seed)
+        traps = TrapField(self.trap_kinds, self.tile_size)
+        grid = TileGrid(maze, self.tile_size, trap_field=traps)
+
+        size = self.tile_size
+        for y, x in zip(*np.nonzero(maze == 1)):
+            walls.add(Object(int(x) * size, int(y) * size, self.wall_img))
+        for kind in (SPIKE, FIRE):
+            ys, xs = np.nonzero(maze == kind)
+            for x, y, slot in zip(xs.tolist(), ys.tolist(), traps.add_many(xs, ys, kind, start_time)):
+                grid.add_trap(x, y, slot)
 
         exit_rect = pygame.Rect(self.exit_pos[0], self.exit_pos[1], self.tile_size, self.tile_size)
-        return walls, spikes, fires, exit_rect
+        grid.exit_rect = exit_rect
+        self.grid = grid
+        return walls, traps, exit_rect
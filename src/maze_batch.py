@@ -0,0 +1,185 @@
+import json
+import multiprocessing
+import operator
+import os
+import re
+import time
+import numpy as np
+from maze import generate_cells
+from tile_grid import TileGrid, WALL, SPIKE, FIRE
+from flow_field import FlowField
+
+MAGIC = b"OOAMAZE1\n"
+START = (1, 1)
+
+# One fixed-width record per maze, stored sorted by seed
+RECORD = np.dtype([
+    ("seed", "<i8"),
+    ("path_length", "<i4"),     # steps from the start to the exit, -1 if unreachable
+    ("dead_ends", "<i4"),       # open cells with a single open neighbour, start and exit excluded
+    ("solution_traps", "<i4"),  # traps on the shortest start-to-exit path
+    ("trap_density", "<f4"),    # solution_traps per cell of that path
+    ("first_trap", "<i4"),      # steps from the start to the nearest trap, -1 if none
+    ("open_cells", "<i4"),
+    ("traps", "<i4"),
+])
+
+
+def maze_metrics(cells, exit_cell):
+    rows, cols = cells.shape
+    field = FlowField(TileGrid(cells, 1), radius=max(rows, cols))
+    field.rebuild(START)
+    ox, oy = field.origin
+    distance = field.distance[-oy:rows - oy, -ox:cols - ox]
+
+    open_cells = cells != WALL
+    traps = (cells == SPIKE) | (cells == FIRE)
+
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = open_cells
+    neighbours = padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:]
+    dead_end = open_cells & (neighbours == 1)
+    dead_end[START[1], START[0]] = False
+
+    path_length = solution_traps = -1
+    if exit_cell and distance[exit_cell[1], exit_cell[0]] >= 0:
+        dead_end[exit_cell[1], exit_cell[0]] = False
+        # Walk the flow field back from the exit to the start
+        x, y = exit_cell
+        path_length = int(distance[y, x])
+        solution_traps = 0
+        while (x, y) != START:
+            solution_traps += bool(traps[y, x])
+            dx, dy = field.step(x, y)
+            x, y = x + dx, y + dy
+
+    reached_traps = distance[traps & (distance >= 0)]
+    return (
+        path_length,
+        int(dead_end.sum()),
+        solution_traps,
+        solution_traps / (path_length + 1) if path_length >= 0 else 0.0,
+        int(reached_traps.min()) if len(reached_traps) else -1,
+        int(open_cells.sum()),
+        int(traps.sum()),
+    )
+
+
+def measure_range(job):
+    # Worker entry point: (first seed, count, cols, rows) -> records
+    first, count, cols, rows = job
+    records = np.empty(count, dtype=RECORD)
+    for i in range(count):
+        seed = first + i
+        records[i] = (seed,) + maze_metrics(*generate_cells(cols, rows, seed))
+    return records
+
+
+def generate(path, count, first_seed=0, size=(25, 25), workers=None, chunk=500):
+    cols, rows = size
+    end = first_seed + count
+    jobs = [(seed, min(chunk, end - seed), cols, rows) for seed in range(first_seed, end, chunk)]
+    parts = []
+    with multiprocessing.Pool(workers) as pool:
+        for records in pool.imap(measure_range, jobs):
+            parts.append(records)
+            done = sum(len(part) for part in parts)
+            print(f"\r{done}/{count} mazes", end="", flush=True)
+    print()
+    records = np.concatenate(parts) if parts else np.empty(0, dtype=RECORD)
+    save_index(path, records, size)
+    return records
+
+
+def save_index(path, records, size):
+    header = {"size": list(size), "count": len(records), "fields": list(RECORD.names)}
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(json.dumps(header).encode() + b"\n")
+        f.write(np.sort(records, order="seed").tobytes())
+
+
+def load_index(path):
+    # Returns (header, records); the records are memory-mapped, not read
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a maze index")
+        header = json.loads(f.readline())
+        offset = f.tell()
+    if header["fields"] != list(RECORD.names):
+        raise ValueError(f"{path} was written with different fields: {header['fields']}")
+    if not header["count"]:
+        return header, np.empty(0, dtype=RECORD)
+    return header, np.memmap(path, dtype=RECORD, mode="r", offset=offset, shape=(header["count"],))
+
+
+OPERATORS = {"<=": operator.le, ">=": operator.ge, "==": operator.eq, "!=": operator.ne,
+             "<": operator.lt, ">": operator.gt}
+CONDITION = re.compile(r"^\s*(\w+)\s*(<=|>=|==|!=|<|>)\s*(-?[\d.]+)\s*$")
+
+
+def query(records, conditions=(), sort=None, descending=False, limit=None):
+    # conditions like "path_length>=80", all of which must hold
+    mask = np.ones(len(records), dtype=bool)
+    for condition in conditions:
+        match = CONDITION.match(condition)
+        if not match or match.group(1) not in RECORD.names:
+            raise ValueError(f"Bad condition {condition!r}, expected FIELD OP NUMBER with FIELD one of {RECORD.names}")
+        field, op, value = match.groups()
+        mask &= OPERATORS[op](records[field], float(value))
+    found = records[mask]
+    if sort:
+        order = np.argsort(found[sort], kind="stable")
+        found = found[order[::-1] if descending else order]
+    return found[:limit] if limit else found
+
+
+def summary(records):
+    lines = [f"{len(records)} mazes"]
+    for field in RECORD.names[1:]:
+        values = records[field]
+        if len(values):
+            p10, p50, p90 = np.percentile(values, (10, 50, 90))
+            lines.append(f"  {field:<15} p10 {p10:8.2f}  p50 {p50:8.2f}  p90 {p90:8.2f}  max {values.max():8.2f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # Headless seed curation, run from the repository root:
+    #   python src/maze_batch.py generate mazes.idx --count 20000 [--first-seed 0] [--size 25 25] [--workers N]
+    #   python src/maze_batch.py query mazes.idx --where "path_length>=120" --where "first_trap>=6" --sort dead_ends --desc
+    # then play one with `python src/main.py --maze-seed SEED`
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+    gen_parser = commands.add_parser("generate", help="generate mazes and write their metrics")
+    gen_parser.add_argument("path")
+    gen_parser.add_argument("--count", type=int, default=10000)
+    gen_parser.add_argument("--first-seed", type=int, default=0)
+    gen_parser.add_argument("--size", type=int, nargs=2, default=(25, 25), metavar=("COLS", "ROWS"))
+    gen_parser.add_argument("--workers", type=int, default=os.cpu_count())
+    query_parser = commands.add_parser("query", help="pick seeds from an index")
+    query_parser.add_argument("path")
+    query_parser.add_argument("--where", action="append", default=[], metavar="FIELD<OP>NUMBER")
+    query_parser.add_argument("--sort", choices=RECORD.names)
+    query_parser.add_argument("--desc", action="store_true", help="sort in descending order")
+    query_parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        start = time.perf_counter()
+        records = generate(args.path, args.count, args.first_seed, tuple(args.size), args.workers)
+        elapsed = time.perf_counter() - start
+        print(f"Wrote {args.path} in {elapsed:.1f}s ({len(records) / elapsed:.0f} mazes/s, {args.workers} workers)")
+        print(summary(records))
+    else:
+        header, records = load_index(args.path)
+        try:
+            found = query(records, args.where, args.sort, args.desc)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"{len(found)} of {header['count']} mazes ({header['size'][0]}x{header['size'][1]}) match")
+        print("  ".join(f"{name:>14}" for name in RECORD.names))
+        for record in found[:args.limit]:
+            print("  ".join(f"{value:>14.3f}" if isinstance(value, float) else f"{value:>14}" for value in record.tolist()))
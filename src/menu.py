@@ -1,19 +1,22 @@
 import pygame
+from asset_manager import asset_manager
+from presenter import presenter
+from text_cache import text_cache
+from audio import audio
+from profiling import profiler
 
 class Menu:
     def __init__(self, screen, font_path=None):
         self.screen = screen
         self.internal_resolution = (800, 600)
-        self.internal_surface = pygame.Surface(self.internal_resolution)
-        self.font = pygame.font.Font(font_path, 36) if font_path else pygame.font.SysFont("Arial", 36)
+        self.font = text_cache.font(font_path, 36, sysfont=False) if font_path else text_cache.font("Arial", 36)
         self.running = True
         self.state = "main"
 
         self.main_options = ["start", "options", "quit"]
         self.options_menu = ["volume", "fullscreen", "back"]
 
-        self.bg_image_raw = pygame.image.load("BrickBG.png").convert()
-        self.bg_image = pygame.transform.scale(self.bg_image_raw, self.internal_resolution)
+        self.bg_image = asset_manager.image("BrickBg.png", self.internal_resolution, "opaque")
 
         self.button_width_ratio = 0.3
         self.button_height_ratio = 0.25
@@ -24,20 +27,46 @@ class Menu:
             int(self.internal_resolution[1] * self.button_height_ratio)
         )
 
+        # File names as they are on disk (case matters outside Windows)
+        button_files = {
+            "start": "start.png",
+            "options": "Options.png",
+            "quit": "Quit.png",
+            "fullscreen": "FullScreen.png",
+            "back": "Back.png",
+            "volume": "Volume.png",
+        }
         self.button_images = {}
-        for key in ["start", "options", "quit", "fullscreen", "back", "volume"]:
-            path = f"assets/Menu/{key.capitalize()}.png" if key != "quit" else "assets/Menu/Quit.png"
-            self.button_images[key] = pygame.transform.scale(
-                pygame.image.load(path).convert_alpha(),
-                self.button_size
-            )
+        self.hover_images = {}
+        for key, filename in button_files.items():
+            path = f"assets/Menu/{filename}"
+            image = asset_manager.image(path, self.button_size)
+            hover = image.copy()
+            overlay = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+            overlay.fill((80, 80, 80, 80))
+            hover.blit(overlay, (0, 0))
+            self.button_images[key] = image
+            self.hover_images[key] = hover
+
+        # Both checkbox states drawn once, so a menu frame is nothing but images
+        check_image = text_cache.render(self.font, "✓", (0, 0, 0))
+        self.checkbox_images = {}
+        for checked in (False, True):
+            box = pygame.Surface((30, 30))
+            box.fill((200, 200, 200))
+            pygame.draw.rect(box, (0, 0, 0), box.get_rect(), 2)
+            if checked:
+                box.blit(check_image, check_image.get_rect(center=box.get_rect().center))
+            self.checkbox_images[checked] = box
 
         self.option_rects = []
         self.checkbox_rects = {}
-        self.last_hover_index = None
-        self.hover_sound = pygame.mixer.Sound("bgm/sfx/ButtonClick.mp3")
+        self.hover_index = None
+        self.hover_sound = asset_manager.sound("bgm/sfx/Buttonclick.mp3")
+        self.clock = pygame.time.Clock()
+        self.needs_redraw = True
 
-        self.is_muted = False
+        self.is_muted = audio.muted
         self.is_fullscreen = False
 
     def get_current_options(self):
@@ -72,73 +101,47 @@ class Menu:
                     checkbox_size
                 )
                 self.checkbox_rects[option] = checkbox_rect
+        self.needs_redraw = True
 
-    def get_internal_mouse_pos(self, mouse_pos):
-        screen_w, screen_h = self.screen.get_size()
-        internal_w, internal_h = self.internal_resolution
-        scale = min(screen_w / internal_w, screen_h / internal_h)
-        scaled_w, scaled_h = internal_w * scale, internal_h * scale
-        x_offset = (screen_w - scaled_w) / 2
-        y_offset = (screen_h - scaled_h) / 2
-
-        x = (mouse_pos[0] - x_offset) / scale
-        y = (mouse_pos[1] - y_offset) / scale
-        return int(x), int(y)
-
-    def draw(self):
-        # Draw background
-        self.internal_surface.blit(self.bg_image, (0, 0))
-        mouse_pos = pygame.mouse.get_pos()
-        internal_mouse_pos = self.get_internal_mouse_pos(mouse_pos)
+    def update_hover(self, internal_mouse_pos):
         hover_index = None
-
-        for i, option in enumerate(self.get_current_options()):
-            img = self.button_images[option].copy()
-            rect = self.option_rects[i]
-
+        for i, rect in enumerate(self.option_rects):
             if rect.collidepoint(internal_mouse_pos):
                 hover_index = i
-                if self.last_hover_index != i:
-                    self.hover_sound.play()
-                overlay = pygame.Surface(img.get_size(), pygame.SRCALPHA)
-                overlay.fill((80, 80, 80, 80))
-                img.blit(overlay, (0, 0))
+                break
 
-            self.internal_surface.blit(img, rect.topleft)
+        if hover_index != self.hover_index:
+            if hover_index is not None:
+                audio.play_clip(self.hover_sound)
+            self.hover_index = hover_index
+            self.needs_redraw = True
+
+    def draw(self):
+        blits = [(self.bg_image, (0, 0))]
+        for i, option in enumerate(self.get_current_options()):
+            images = self.hover_images if i == self.hover_index else self.button_images
+            blits.append((images[option], self.option_rects[i].topleft))
 
             if option in self.checkbox_rects:
                 checked = self.is_muted if option == "volume" else self.is_fullscreen
-                checkbox_rect = self.checkbox_rects[option]
-                pygame.draw.rect(self.internal_surface, (200, 200, 200), checkbox_rect)
-                pygame.draw.rect(self.internal_surface, (0, 0, 0), checkbox_rect, 2)
-                if checked:
-                    check = self.font.render("✓", True, (0, 0, 0))
-                    check_rect = check.get_rect(center=checkbox_rect.center)
-                    self.internal_surface.blit(check, check_rect)
-
-        self.last_hover_index = hover_index
+                blits.append((self.checkbox_images[checked], self.checkbox_rects[option].topleft))
 
         # Scale to screen with aspect ratio preserved
-        screen_w, screen_h = self.screen.get_size()
-        internal_w, internal_h = self.internal_resolution
-        scale = min(screen_w / internal_w, screen_h / internal_h)
-        scaled_w, scaled_h = int(internal_w * scale), int(internal_h * scale)
-
-        scaled_surface = pygame.transform.smoothscale(self.internal_surface, (scaled_w, scaled_h))
-        x_offset = (screen_w - scaled_w) // 2
-        y_offset = (screen_h - scaled_h) // 2
-
-        self.screen.fill((0, 0, 0))  # black bars
-        self.screen.blit(scaled_surface, (x_offset, y_offset))
-        pygame.display.flip()
+        presenter.present_static(self.screen, blits, smooth=True)
+        self.needs_redraw = False
 
-    def handle_input(self):
-        for event in pygame.event.get():
+    def handle_input(self, events):
+        for event in events:
+            presenter.handle_event(event)
             if event.type == pygame.QUIT:
                 self.running = False
                 return "quit"
+            elif event.type in (pygame.VIDEORESIZE, pygame.WINDOWSIZECHANGED, pygame.WINDOWEXPOSED):
+                self.needs_redraw = True
+            elif event.type == pygame.MOUSEMOTION:
+                self.update_hover(presenter.event_pos(event))
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                internal_pos = self.get_internal_mouse_pos(event.pos)
+                internal_pos = presenter.event_pos(event)
 
                 for key, rect in self.checkbox_rects.items():
                     if rect.collidepoint(internal_pos):
@@ -170,21 +173,27 @@ class Menu:
 
     def toggle_volume(self):
         self.is_muted = not self.is_muted
-        pygame.mixer.music.set_volume(0.0 if self.is_muted else 1.0)
+        self.needs_redraw = True
+        audio.set_muted(self.is_muted)
 
     def toggle_fullscreen(self):
         self.is_fullscreen = not self.is_fullscreen
-        if self.is_fullscreen:
-            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        else:
-            self.screen = pygame.display.set_mode(self.internal_resolution, pygame.RESIZABLE)
-        self.bg_image = pygame.transform.scale(self.bg_image_raw, self.internal_resolution)
+        self.screen = presenter.set_fullscreen(self.is_fullscreen)
+        self.bg_image = asset_manager.image("BrickBg.png", self.internal_resolution, "opaque")
         self.create_option_rects()
 
     def run(self):
+        # Sleep in event.wait() until something happens, then redraw at most
+        # once per frame and only if the menu actually changed
         self.create_option_rects()
+        presenter.invalidate()
         while self.running:
-            action = self.handle_input()
+            events = [] if self.needs_redraw else [pygame.event.wait()]
+            action = self.handle_input(events + pygame.event.get())
             if action in self.main_options:
                 return action
-            self.draw()
+            if self.needs_redraw:
+                self.update_hover(presenter.to_internal(pygame.mouse.get_pos()))
+                self.draw()
+                self.clock.tick(60)
+                profiler.end_frame()
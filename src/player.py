@@ -1,6 +1,9 @@
 import pygame
 from entity import Entity
 from boss import PlayerProjectile
+from asset_manager import asset_manager
+from controls import KeyboardInput
+from audio import audio
 
 class Player(Entity):
     def __init__(self, x, y):
@@ -8,8 +11,7 @@ class Player(Entity):
         self.__speed = 200
         self.hitbox = pygame.Rect(self.rect.left + 40, self.rect.top + 32, 16, 32)
 
-        self.footsteep_sound = pygame.mixer.Sound("bgm/sfx/footstep.wav")
-        self.footsteep_sound.set_volume(0.5)
+        self.footsteep_sound = asset_manager.sound("bgm/sfx/footstep.wav", 0.5)
         self.footsteep_playing = False
 
         self.invincible = False
@@ -20,66 +22,63 @@ class Player(Entity):
         self.has_spear = False
         self.throw_cooldown = 0
 
-    def update(self, dt, *args):
-        collisions = args[0] if args else None
-        keys = pygame.key.get_pressed()
+    def update(self, dt, grid=None, controls=None, current_time=None):
+        if controls is None:
+            controls = KeyboardInput().poll()
         dx = dy = 0
 
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        if controls.left:
             dx = -self.__speed * dt
             self.direction = "left"
-        elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        elif controls.right:
             dx = self.__speed * dt
             self.direction = "right"
-        elif keys[pygame.K_UP] or keys[pygame.K_w]:
+        elif controls.up:
             dy = -self.__speed * dt
             self.direction = "up"
-        elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
+        elif controls.down:
             dy = self.__speed * dt
             self.direction = "down"
 
         # Move and collision
         self.rect.x += dx
         self.hitbox.x += dx
-        if collisions:
-            for sprite in collisions:
-                if self.hitbox.colliderect(sprite.rect):
-                    self.rect.x -= dx
-                    self.hitbox.x -= dx
+        if grid and grid.collides(self.hitbox):
+            self.rect.x -= dx
+            self.hitbox.x -= dx
 
         self.rect.y += dy
         self.hitbox.y += dy
-        if collisions:
-            for sprite in collisions:
-                if self.hitbox.colliderect(sprite.rect):
-                    self.rect.y -= dy
-                    self.hitbox.y -= dy
+        if grid and grid.collides(self.hitbox):
+            self.rect.y -= dy
+            self.hitbox.y -= dy
 
         if dx != 0 or dy != 0:
             self.animate(dt)
             if not self.footsteep_playing:
-                self.footsteep_sound.play(-1)
+                audio.play_clip(self.footsteep_sound, -1)
                 self.footsteep_playing = True
         else:
             self.current_frame = 0
             self.image = self.frames[self.direction][self.current_frame]
-            if self.footsteep_playing:
-                self.footsteep_sound.stop()
-                self.footsteep_playing = False
+            self.stop_footsteps()
 
         # Invincibility flicker
-        now = pygame.time.get_ticks()
+        now = pygame.time.get_ticks() if current_time is None else current_time
         if self.invincible:
             if now - self.invincible_timer >= self.invincibility_duration:
                 self.invincible = False
-                self.image.set_alpha(255)
+                self.set_variant("normal")
             else:
-                self.image.set_alpha(0 if (now // 100) % 2 == 0 else 255)
-        else:
-            self.image.set_alpha(255)
+                self.set_variant("hidden" if (now // 100) % 2 == 0 else "normal")
 
         self.throw_cooldown = max(0, self.throw_cooldown - dt)
 
+    def stop_footsteps(self):
+        if self.footsteep_playing:
+            audio.stop_clip(self.footsteep_sound)
+            self.footsteep_playing = False
+
     def take_damage(self, damage_amount, current_time, hp_bar):
         if current_time - self.last_hit_time >= self.invincibility_duration:
             super().take_damage(damage_amount)
@@ -91,7 +90,7 @@ class Player(Entity):
             if self.health <= 0:
                 print("Game Over!")
 
-    def throw_spear(self, projectile_group):
+    def throw_spear(self, projectile_group, current_time=None):
         if self.throw_cooldown > 0 or not self.has_spear:
             return
         dir_map = {
@@ -101,7 +100,7 @@ class Player(Entity):
             "right": pygame.Vector2(1, 0)
         }
         direction = dir_map[self.direction]
-        proj = PlayerProjectile(self.rect.centerx, self.rect.centery, direction)
+        proj = PlayerProjectile(self.rect.centerx, self.rect.centery, direction, current_time)
         projectile_group.add(proj)
         self.has_spear = False
         self.throw_cooldown = 1  # 1 second cooldown
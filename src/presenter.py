@@ -0,0 +1,233 @@
+import os
+import weakref
+import pygame
+
+
+class TextureBackend:
+    # Final compositing and scaling on an SDL2 Renderer. Frames are uploaded
+    # into a streaming texture (only the dirty parts when given) and the
+    # renderer letterboxes them through its logical size. Static images are
+    # uploaded once and keep their texture for as long as the surface lives.
+    def __init__(self, internal_size, title, icon=None, software=False, border_color=(0, 0, 0)):
+        from pygame._sdl2.video import Window, Renderer
+        self.window = Window(title, internal_size, resizable=True)
+        if icon is not None:
+            self.window.set_icon(icon)
+        # accelerated=0 asks for SDL's software renderer, which needs no GPU
+        self.renderer = Renderer(self.window, accelerated=0 if software else -1)
+        self.renderer.logical_size = internal_size
+        self.renderer.draw_color = (*border_color, 255)
+        self.internal_size = internal_size
+        self.frame_textures = {}  # smooth -> streaming texture
+        self.last_smooth = None
+        self.textures = weakref.WeakKeyDictionary()  # surface -> texture
+
+    def create_texture(self, smooth, surface=None):
+        from pygame._sdl2.video import Texture
+        # SDL reads the filter from this hint when a texture is created
+        os.environ["SDL_RENDER_SCALE_QUALITY"] = "linear" if smooth else "nearest"
+        if surface is not None:
+            return Texture.from_surface(self.renderer, surface)
+        return Texture(self.renderer, self.internal_size, streaming=True)
+
+    def present(self, internal_surface, dirty_rects=None, smooth=False, full=True):
+        texture = self.frame_textures.get(smooth)
+        if texture is None:
+            texture = self.frame_textures[smooth] = self.create_texture(smooth)
+        if full or dirty_rects is None or smooth != self.last_smooth:
+            texture.update(internal_surface)
+        else:
+            bounds = internal_surface.get_rect()
+            for rect in dirty_rects:
+                rect = pygame.Rect(rect).clip(bounds)
+                if rect.w and rect.h:
+                    texture.update(internal_surface.subsurface(rect), area=rect)
+        self.last_smooth = smooth
+        self.renderer.clear()
+        texture.draw()
+        self.renderer.present()
+
+    def present_static(self, blits, smooth=False):
+        self.renderer.clear()
+        for surface, pos in blits:
+            texture = self.textures.get(surface)
+            if texture is None:
+                texture = self.textures[surface] = self.create_texture(smooth, surface)
+            texture.draw(dstrect=pos)
+        self.renderer.present()
+        self.last_smooth = None  # the frame textures no longer match the window
+
+    def to_internal(self, pos):
+        viewport = self.renderer.get_viewport()
+        scale_x, scale_y = self.renderer.scale
+        return pos[0] / scale_x - viewport.x, pos[1] / scale_y - viewport.y
+
+    def set_fullscreen(self, fullscreen):
+        if fullscreen:
+            self.window.set_fullscreen(desktop=True)
+        else:
+            self.window.set_windowed()
+
+
+class Presenter:
+    # Letterboxes the fixed-size internal surface onto the window. Geometry is
+    # only recomputed when the window surface or its size changes, and the
+    # scaled image is written straight into a subsurface of the window.
+    def __init__(self, internal_size, border_color=(0, 0, 0)):
+        self.internal_size = internal_size
+        self.border_color = border_color
+        self.display = None
+        self.window_size = None
+        self.full_redraw = True
+        self.backend = None  # TextureBackend when the SDL2 renderer is in use
+        self.scratch = None  # internal-size surface for present_static()
+
+    def open_window(self, title, icon=None, renderer=None):
+        # renderer: None for the software surface path, or "software" / "gpu"
+        # for the SDL2 Renderer. Returns the display surface to present with.
+        if renderer:
+            try:
+                # A hidden display-module window still provides the pixel
+                # format that convert() and convert_alpha() need
+                display_surface = pygame.display.set_mode(self.internal_size, pygame.HIDDEN)
+                self.backend = TextureBackend(self.internal_size, title, icon, renderer == "software", self.border_color)
+                self.full_redraw = True
+                return display_surface
+            except (ImportError, RuntimeError, pygame.error) as e:
+                print(f"[Error] SDL2 renderer unavailable, drawing with surfaces: {e}")
+                self.backend = None
+        display_surface = pygame.display.set_mode(self.internal_size, pygame.RESIZABLE)
+        pygame.display.set_caption(title)
+        if icon is not None:
+            pygame.display.set_icon(icon)
+        return display_surface
+
+    def set_fullscreen(self, fullscreen):
+        # Returns the (possibly new) display surface
+        self.invalidate()
+        if self.backend:
+            self.backend.set_fullscreen(fullscreen)
+            return pygame.display.get_surface()
+        if fullscreen:
+            return pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        return pygame.display.set_mode(self.internal_size, pygame.RESIZABLE)
+
+    def resize(self, display_surface):
+        iw, ih = self.internal_size
+        win_w, win_h = display_surface.get_size()
+        self.display = display_surface
+        self.window_size = (win_w, win_h)
+
+        self.scale = min(win_w / iw, win_h / ih)
+        scaled_w, scaled_h = int(iw * self.scale), int(ih * self.scale)
+        self.dest_rect = pygame.Rect((win_w - scaled_w) // 2, (win_h - scaled_h) // 2, scaled_w, scaled_h)
+
+        # Whole multiples of the internal size can be scaled region by region
+        # without seams, which is what makes dirty rects possible
+        factor = int(self.scale)
+        self.integer_scale = factor if factor >= 1 and (scaled_w, scaled_h) == (iw * factor, ih * factor) else 0
+
+        self.target = display_surface.subsurface(self.dest_rect) if scaled_w and scaled_h else None
+        self.full_redraw = True
+
+    def invalidate(self):
+        # Repaint everything on the next present, e.g. after a VIDEORESIZE
+        self.full_redraw = True
+
+    def handle_event(self, event):
+        if event.type in (pygame.VIDEORESIZE, pygame.WINDOWSIZECHANGED, pygame.WINDOWEXPOSED):
+            self.invalidate()
+        elif event.type == pygame.WINDOWCLOSE and self.backend:
+            # The hidden display window stays open, so SDL sends no QUIT itself
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    def event_pos(self, event):
+        # Mouse event position in internal coordinates; the renderer has
+        # already mapped it through its logical size
+        return event.pos if self.backend else self.to_internal(event.pos)
+
+    def to_window(self, rect):
+        k = self.integer_scale
+        return pygame.Rect(self.dest_rect.x + rect.x * k, self.dest_rect.y + rect.y * k, rect.w * k, rect.h * k)
+
+    def to_internal(self, pos):
+        # Window coordinates (e.g. pygame.mouse.get_pos()) back to internal coordinates
+        if self.backend:
+            return self.backend.to_internal(pos)
+        display_surface = pygame.display.get_surface()
+        if display_surface is not self.display or display_surface.get_size() != self.window_size:
+            self.resize(display_surface)
+        return (
+            (pos[0] - self.dest_rect.x) / self.scale,
+            (pos[1] - self.dest_rect.y) / self.scale,
+        )
+
+    def present(self, display_surface, internal_surface, dirty_rects=None, smooth=False):
+        # dirty_rects: internal-space rects that changed since the last present,
+        # or None when the whole frame may have changed. smooth filters the
+        # whole frame and so always presents it in full.
+        if self.backend:
+            if dirty_rects is not None and not dirty_rects and not self.full_redraw:
+                return
+            self.backend.present(internal_surface, dirty_rects, smooth, self.full_redraw)
+            self.full_redraw = False
+            return
+
+        if display_surface is not self.display or display_surface.get_size() != self.window_size:
+            self.resize(display_surface)
+        if self.target is None:
+            return
+
+        if self.full_redraw:
+            display_surface.fill(self.border_color)
+            self.blit_scaled(internal_surface, self.target, smooth)
+            pygame.display.flip()
+            self.full_redraw = False
+            return
+
+        if dirty_rects is not None and not dirty_rects:
+            return
+        # A whole multiple only pays off through the dirty rects below: for a
+        # full frame, SDL's nearest-neighbour scale into the cached target is
+        # already the fastest path (scale2x and numpy repeats measured slower)
+        if dirty_rects is None or not self.integer_scale or smooth:
+            self.blit_scaled(internal_surface, self.target, smooth)
+            pygame.display.update(self.dest_rect)
+            return
+
+        bounds = internal_surface.get_rect()
+        updated = []
+        for rect in dirty_rects:
+            rect = pygame.Rect(rect).clip(bounds)
+            if not rect.w or not rect.h:
+                continue
+            window_rect = self.to_window(rect)
+            self.blit_scaled(internal_surface.subsurface(rect), self.display.subsurface(window_rect))
+            updated.append(window_rect)
+        if updated:
+            pygame.display.update(updated)
+
+    def present_static(self, display_surface, blits, smooth=False):
+        # A frame made only of long-lived images, e.g. the menu: the renderer
+        # draws them from cached textures, the surface path composes them
+        if self.backend:
+            self.backend.present_static(blits, smooth)
+            return
+        if self.scratch is None:
+            self.scratch = pygame.Surface(self.internal_size)
+        self.scratch.blits(blits, doreturn=False)
+        self.present(display_surface, self.scratch, smooth=smooth)
+
+    def blit_scaled(self, source, dest, smooth=False):
+        if source.get_size() == dest.get_size():
+            dest.blit(source, (0, 0))
+            return
+        scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+        try:
+            scale(source, dest.get_size(), dest)
+        except ValueError:
+            # Pixel formats differ, so scale into a new surface instead
+            dest.blit(scale(source, dest.get_size()), (0, 0))
+
+
+presenter = Presenter((800, 600))
@@ -0,0 +1,220 @@
+import cProfile
+import json
+import marshal
+import os
+import platform
+import pstats
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+import pygame
+
+
+def build_info():
+    try:
+        revision = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True, text=True, timeout=2
+        ).stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        revision = "unknown"
+    return {
+        "revision": revision,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+    }
+
+
+def frame_label(key):
+    filename, line, name = key
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def write_folded(path, stacks):
+    # stacks: Counter of root-first tuples of (filename, line, name) keys
+    with open(path, "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{';'.join(frame_label(key) for key in stack)} {count}\n")
+
+
+def folded_from_stats(stats, min_us=1):
+    # cProfile keeps caller/callee edges, not whole stacks, so stacks are
+    # rebuilt from the roots down, splitting each function's time between
+    # its callers by their share of its cumulative time. Counts are in us.
+    callees = {}
+    for func, (_, _, _, ct, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3] / ct if ct else 0))
+    stacks = Counter()
+
+    def walk(func, stack, share):
+        self_us = round(stats[func][2] * share * 1e6)
+        if self_us >= min_us:
+            stacks[stack] += self_us
+        for callee, fraction in callees.get(func, ()):
+            if callee not in stack and stats[callee][3] * share * fraction * 1e6 >= min_us:
+                walk(callee, stack + (callee,), share * fraction)
+
+    for func, entry in stats.items():
+        if not entry[4]:
+            walk(func, (func,), 1.0)
+    return stacks
+
+
+class CProfileCapture:
+    # Exact call counts and times; the collapsed stacks written next to the
+    # .prof are an estimate (see folded_from_stats)
+    def start(self):
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def write(self, base):
+        self.profile.dump_stats(base + ".prof")
+        write_folded(base + ".folded", folded_from_stats(pstats.Stats(self.profile).stats))
+
+
+class SamplingCapture:
+    # Samples the main thread's stack from a helper thread. Much lower
+    # overhead than cProfile, and keeps whole stacks, which it writes in
+    # the collapsed format flame graph tools read. The .prof written next
+    # to it counts samples, not calls.
+    def __init__(self, interval_ms=1):
+        self.interval = interval_ms / 1000
+        self.thread_id = threading.main_thread().ident
+        self.stacks = Counter()
+
+    def start(self):
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+
+    def sample(self):
+        while not self.stopping.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def stop(self):
+        self.stopping.set()
+        self.thread.join()
+
+    def write(self, base):
+        write_folded(base + ".folded", self.stacks)
+        with open(base + ".prof", "wb") as f:
+            marshal.dump(self.pstats(), f)
+
+    def pstats(self):
+        # The dict pstats.Stats loads: func -> (calls, calls, self s, cumulative s, callers)
+        stats = {}
+        for stack, count in self.stacks.items():
+            seconds = count * self.interval
+            seen = set()
+            for i, func in enumerate(stack):
+                calls, _, tt, ct, callers = stats.get(func) or (0, 0, 0.0, 0.0, {})
+                leaf = i == len(stack) - 1
+                if func not in seen:
+                    calls, ct = calls + count, ct + seconds
+                    seen.add(func)
+                if leaf:
+                    tt += seconds
+                if i:
+                    edge = callers.get(stack[i - 1], (0, 0, 0.0, 0.0))
+                    callers[stack[i - 1]] = (edge[0] + count, edge[1] + count,
+                                             edge[2] + (seconds if leaf else 0.0), edge[3] + seconds)
+                stats[func] = (calls, calls, tt, ct, callers)
+        return stats
+
+
+class Profiler:
+    # Captures one scene (menu, prolog, cutscene, maze, boss), or the next N
+    # frames after F4. Configured from the environment:
+    #   OOA_PROFILE=maze,boss      scenes to capture ("all" for every scene)
+    #   OOA_PROFILE_FRAMES=300     stop after this many frames (0: whole scene)
+    #   OOA_PROFILE_MODE=sample    "cprofile" (default) or "sample"
+    #   OOA_PROFILE_DIR=profiles   where captures are written
+    def __init__(self, environ=os.environ):
+        self.targets = {name for name in environ.get("OOA_PROFILE", "").split(",") if name}
+        self.frame_limit = int(environ.get("OOA_PROFILE_FRAMES", "0"))
+        self.hotkey_frames = self.frame_limit or 300
+        self.mode = environ.get("OOA_PROFILE_MODE", "cprofile")
+        self.out_dir = environ.get("OOA_PROFILE_DIR", "profiles")
+        self.scene_name = None
+        self.frame = 0
+        self.capture = None
+        self.written = []
+
+    def enter_scene(self, name):
+        self.leave_scene()
+        self.scene_name = name
+        if name in self.targets or "all" in self.targets:
+            self.start(self.frame_limit)
+
+    def leave_scene(self):
+        if self.capture:
+            self.stop()
+        self.scene_name = None
+
+    @contextmanager
+    def scene(self, name):
+        self.enter_scene(name)
+        try:
+            yield
+        finally:
+            self.leave_scene()
+
+    def request(self, frames=None):
+        # Hotkey entry point: capture the next frames of whatever is running
+        if not self.capture:
+            self.start(frames or self.hotkey_frames)
+
+    def end_frame(self):
+        self.frame += 1
+        capture = self.capture
+        if capture and capture["frames"] and self.frame - capture["start"] >= capture["frames"]:
+            self.stop()
+
+    def start(self, frames):
+        backend = SamplingCapture() if self.mode == "sample" else CProfileCapture()
+        self.capture = {
+            "backend": backend,
+            "scene": self.scene_name or "unknown",
+            "start": self.frame,
+            "frames": frames,
+            "started_at": time.time(),
+        }
+        backend.start()
+
+    def stop(self):
+        capture, self.capture = self.capture, None
+        backend = capture["backend"]
+        backend.stop()
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        scene, first, last = capture["scene"], capture["start"], self.frame
+        base = os.path.join(self.out_dir, f"{scene}_f{first}-{last}_{time.strftime('%Y%m%d-%H%M%S')}")
+        backend.write(base)
+        with open(base + ".json", "w") as f:
+            json.dump({
+                "scene": scene,
+                "frames": [first, last],
+                "seconds": round(time.time() - capture["started_at"], 3),
+                "mode": self.mode,
+                "build": build_info(),
+            }, f, indent=2)
+        self.written += [base + ".prof", base + ".folded"]
+        print(f"Profile written to {base}.prof and .folded")
+
+
+profiler = Profiler()
@@ -1,23 +1,21 @@
 import pygame
 import math
+from asset_manager import asset_manager
 
 class Projectile(pygame.sprite.Sprite):
-    def __init__(self, x, y, image_path, angle=0, speed=200, size=(12, 12), ttl=8000, rotate_image=False):
+    def __init__(self, x, y, image_path, angle=0, speed=200, size=(12, 12), ttl=8000, rotate_image=False, spawn_time=None):
         super().__init__()
-        original_image = pygame.image.load(image_path).convert_alpha()
-
-        if rotate_image:
-            original_image = pygame.transform.rotate(original_image, angle)
-
-        self.image = pygame.transform.scale(original_image, size)
+        self.image = asset_manager.image(image_path, size, angle=angle if rotate_image else 0)
         self.rect = self.image.get_rect(center=(x, y))
 
         self.vel = pygame.Vector2(speed, 0).rotate(angle)
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = pygame.time.get_ticks() if spawn_time is None else spawn_time
         self.ttl = ttl  # time to live in milliseconds
 
-    def update(self, dt):
+    def update(self, dt, current_time=None):
         self.rect.x += self.vel.x * dt
         self.rect.y += self.vel.y * dt
-        if pygame.time.get_ticks() - self.spawn_time > self.ttl:
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
+        if current_time - self.spawn_time > self.ttl:
             self.kill()
\ No newline at end of file
@@ -1,5 +1,9 @@
 import pygame
 import os
+from asset_manager import asset_manager, preloader
+from presenter import presenter
+from text_cache import text_cache
+from profiling import profiler
 
 class Prolog:
     def __init__(self, screen, dialogue_list, background_name, on_complete=None):
@@ -14,42 +18,39 @@ class Prolog:
             background_path = f"assets/backgrounds/{background_name}"
             if not os.path.exists(background_path):
                 raise FileNotFoundError(f"Background not found: {background_path}")
-            self.background = pygame.image.load(background_path).convert()
-            self.background = pygame.transform.scale(self.background, (self.INTERNAL_WIDTH, self.INTERNAL_HEIGHT))
+            self.background = asset_manager.image(background_path, (self.INTERNAL_WIDTH, self.INTERNAL_HEIGHT), "opaque")
         except Exception as e:
             print(f"[Error] Failed to load background: {e}")
             self.background = pygame.Surface((self.INTERNAL_WIDTH, self.INTERNAL_HEIGHT))
             self.background.fill((0, 0, 0))  # Fallback to black background
 
-        # Load font safely
-        try:
-            self.font = pygame.font.SysFont("arial", 24)
-        except Exception as e:
-            print(f"[Error] Failed to load font: {e}")
-            self.font = pygame.font.Font(None, 24)
+        # Falls back to the default font if arial can't be loaded
+        self.font = text_cache.font("arial", 24)
+        self.prompt_font = text_cache.font("arial", 18)
 
         self.text_color = (255, 255, 255)
         self.box_color = (0, 0, 0, 180)
+        self.box_rect = pygame.Rect(50, 450, 700, 120)
+        self.box_surf = pygame.Surface(self.box_rect.size, pygame.SRCALPHA)
+        self.box_surf.fill(self.box_color)
         self.index = 0
         self.on_complete = on_complete or (lambda: None)
         self.clock = pygame.time.Clock()
+        self.needs_redraw = True
 
     def draw_text_box(self, text):
         try:
-            box_rect = pygame.Rect(50, 450, 700, 120)
+            box_rect = self.box_rect
             
-            # Create background box with transparency
-            box_surf = pygame.Surface((box_rect.width, box_rect.height), pygame.SRCALPHA)
-            box_surf.fill(self.box_color)
-            self.internal_surface.blit(box_surf, box_rect.topleft)
+            # Background box with transparency
+            self.internal_surface.blit(self.box_surf, box_rect.topleft)
 
             # Render main dialogue text
-            text_surface = self.font.render(text, True, self.text_color)
+            text_surface = text_cache.render(self.font, text, self.text_color)
             self.internal_surface.blit(text_surface, (box_rect.left + 20, box_rect.top + 20))
 
             # Render "Press 'Space' to continue" in smaller font
-            prompt_font = pygame.font.SysFont("arial", 18)
-            prompt_text = prompt_font.render("Press 'Space' to continue", True, self.text_color)
+            prompt_text = text_cache.render(self.prompt_font, "Press 'Space' to continue", self.text_color)
             prompt_rect = prompt_text.get_rect(bottomright=(box_rect.right - 20, box_rect.bottom - 10))
             self.internal_surface.blit(prompt_text, prompt_rect)
         except Exception as e:
@@ -57,15 +58,20 @@ class Prolog:
 
     def run(self):
         running = True
+        presenter.invalidate()
         while running:
             dt = self.clock.tick(60)
+            profiler.end_frame()
+            preloader.pump()
 
             for event in pygame.event.get():
+                presenter.handle_event(event)
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     exit()
                 elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
                     self.index += 1
+                    self.needs_redraw = True
                     if self.index >= len(self.dialogue):
                         running = False
                         try:
@@ -74,28 +80,17 @@ class Prolog:
                             print(f"[Error] on_complete callback failed: {e}")
 
             try:
-                self.internal_surface.blit(self.background, (0, 0))
-                if self.index < len(self.dialogue):
-                    self.draw_text_box(self.dialogue[self.index])
-                else:
-                    self.draw_text_box("[End of dialogue]")
-
-                # Safely scale surface
-                try:
-                    win_w, win_h = self.display_surface.get_size()
-                    scale = min(win_w / self.INTERNAL_WIDTH, win_h / self.INTERNAL_HEIGHT)
-                    scaled_w = int(self.INTERNAL_WIDTH * scale)
-                    scaled_h = int(self.INTERNAL_HEIGHT * scale)
-                    x_offset = (win_w - scaled_w) // 2
-                    y_offset = (win_h - scaled_h) // 2
-                except Exception as e:
-                    print(f"[Error] Failed to get display size or scale surface: {e}")
-                    scaled_w, scaled_h = self.INTERNAL_WIDTH, self.INTERNAL_HEIGHT
-                    x_offset = y_offset = 0
+                # The page only changes on Space, so idle frames present nothing
+                dirty = []
+                if self.needs_redraw:
+                    self.internal_surface.blit(self.background, (0, 0))
+                    if self.index < len(self.dialogue):
+                        self.draw_text_box(self.dialogue[self.index])
+                    else:
+                        self.draw_text_box("[End of dialogue]")
+                    dirty = None
+                    self.needs_redraw = False
 
-                scaled_surface = pygame.transform.scale(self.internal_surface, (scaled_w, scaled_h))
-                self.display_surface.fill((0, 0, 0))
-                self.display_surface.blit(scaled_surface, (x_offset, y_offset))
-                pygame.display.flip()
+                presenter.present(self.display_surface, self.internal_surface, dirty)
             except Exception as e:
                 print(f"[Error] Failed during rendering: {e}")
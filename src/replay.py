@@ -0,0 +1,191 @@
+import json
+import zlib
+from array import array
+from controls import InputState, NO_INPUT, ScriptedInput
+
+MAGIC = b"OOAREC1\n"
+
+
+def pack_input(state):
+    bits = 0
+    for i, pressed in enumerate(state):
+        if pressed:
+            bits |= 1 << i
+    return bits
+
+
+def unpack_input(bits):
+    return InputState(*(bool(bits & (1 << i)) for i in range(len(InputState._fields))))
+
+
+def sim_summary(sim):
+    return {
+        "ticks": sim.ticks,
+        "phase": sim.phase,
+        "result": sim.result,
+        "player": list(sim.player.rect.topleft),
+        "health": sim.player.health,
+    }
+
+
+class Recorder:
+    # Stands in for both the clock and the controls of a Simulation and logs
+    # what they return each tick. Time is sampled once per tick, so every
+    # get_ticks() call within a tick (and before the first one) sees the
+    # same value, both while recording and on replay.
+    def __init__(self, controls, clock):
+        self.controls = controls
+        self.clock = clock
+        self.start_ticks = clock.get_ticks()
+        self.now = self.start_ticks
+        self.dts = array("d")
+        self.times = array("q")
+        self.inputs = bytearray()
+
+    def tick(self, fps):
+        dt = self.clock.tick(fps)
+        self.now = self.clock.get_ticks()
+        self.dts.append(dt)
+        self.times.append(self.now)
+        return dt
+
+    def get_ticks(self):
+        return self.now
+
+    def poll(self):
+        state = self.controls.poll() if self.controls else NO_INPUT
+        self.inputs.append(pack_input(state))
+        return state
+
+    def save(self, path, sim):
+        header = {
+            "seed": sim.seed,
+            "settings": sim.settings,
+            "start_ticks": self.start_ticks,
+            "ticks": len(self.inputs),
+            "final": sim_summary(sim),
+        }
+        # Header line, then the three per-tick streams compressed together
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(json.dumps(header).encode() + b"\n")
+            f.write(zlib.compress(self.dts.tobytes() + self.times.tobytes() + bytes(self.inputs), 9))
+
+
+class ReplayClock:
+    def __init__(self, start_ticks, dts, times):
+        self.now = start_ticks
+        self.dts = dts
+        self.times = times
+        self.index = 0
+
+    def tick(self, fps):
+        if self.index >= len(self.dts):
+            return 1000 / fps  # past the end of the log
+        dt = self.dts[self.index]
+        self.now = self.times[self.index]
+        self.index += 1
+        return dt
+
+    def get_ticks(self):
+        return self.now
+
+
+class Replay:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a recording")
+            self.header = json.loads(f.readline())
+            payload = zlib.decompress(f.read())
+
+        count = self.header["ticks"]
+        self.dts = array("d")
+        self.times = array("q")
+        self.dts.frombytes(payload[:count * 8])
+        self.times.frombytes(payload[count * 8:count * 16])
+        self.inputs = [unpack_input(bits) for bits in payload[count * 16:]]
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def simulation(self):
+        from simulation import Simulation
+        clock = ReplayClock(self.header["start_ticks"], self.dts, self.times)
+        return Simulation(
+            seed=self.header["seed"],
+            controls=ScriptedInput(self.inputs),
+            clock=clock,
+            **self.header["settings"]
+        )
+
+    def matches(self, sim):
+        return sim_summary(sim) == self.header["final"]
+
+
+def run_headless(replay):
+    sim = replay.simulation()
+    for _ in range(len(replay)):
+        if sim.step() in ("dead", "victory"):
+            break
+    return sim
+
+
+def run_rendered(replay):
+    # Draws every tick through the normal scene code, as fast as it can
+    import pygame
+    from game import Game
+    from camera import Camera
+    from presenter import presenter
+
+    game = Game()
+    pygame.init()
+    display_surface = pygame.display.set_mode((game.INTERNAL_WIDTH, game.INTERNAL_HEIGHT), pygame.RESIZABLE)
+    internal_surface = pygame.Surface((game.INTERNAL_WIDTH, game.INTERNAL_HEIGHT))
+    sim = replay.simulation()
+    camera = Camera(game.INTERNAL_WIDTH, game.INTERNAL_HEIGHT)
+    static_layer = game.build_static_layer(sim)
+
+    for _ in range(len(replay)):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return sim
+            presenter.handle_event(event)
+        outcome = sim.step()
+        if outcome in ("dead", "victory"):
+            break
+        if outcome == "boss":
+            camera = Camera(game.INTERNAL_WIDTH, game.INTERNAL_HEIGHT)
+        camera.update(sim.player)
+        if sim.phase == "maze":
+            game.draw_maze_scene(internal_surface, sim, camera, static_layer)
+        else:
+            game.draw_boss_scene(internal_surface, sim, camera)
+        presenter.present(display_surface, internal_surface)
+    return sim
+
+
+if __name__ == "__main__":
+    # Play back a file written by `python src/main.py --record FILE`:
+    #   python src/replay.py FILE            headless, maximum speed
+    #   python src/replay.py FILE --render   with rendering, unthrottled
+    import os
+    import sys
+    import time
+
+    if len(sys.argv) < 2:
+        print("usage: replay.py FILE [--render]")
+        sys.exit(2)
+    render = "--render" in sys.argv
+    if not render:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    replay = Replay(sys.argv[1])
+    start = time.perf_counter()
+    sim = run_rendered(replay) if render else run_headless(replay)
+    elapsed = time.perf_counter() - start
+    print(f"{sim.ticks} ticks in {elapsed:.2f}s ({sim.ticks / elapsed:.0f} ticks/s), "
+          f"phase={sim.phase}, result={sim.result}")
+    print("matches recording" if replay.matches(sim) else
+          f"DIVERGED: expected {replay.header['final']}, got {sim_summary(sim)}")
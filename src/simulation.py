@@ -0,0 +1,202 @@
+import os
+import random
+import time
+import pygame
+from player import Player
+from hpbar import HPBar
+from maze import Maze
+from boss_map import BossMap
+from streaming_world import StreamingWorld
+from flow_field import FlowField
+from guardian import Guardian
+from visibility import Visibility
+from tile_grid import SPIKE, FIRE
+from controls import NO_INPUT
+from timing import timings
+from asset_manager import asset_manager
+
+
+class RealClock:
+    def __init__(self):
+        self.clock = pygame.time.Clock()
+
+    def tick(self, fps):
+        return self.clock.tick(fps)
+
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+
+class FixedClock:
+    # Advances by exactly one frame per tick and never sleeps
+    def __init__(self, start=0):
+        self.now = start
+
+    def tick(self, fps):
+        step = 1000 / fps
+        self.now += step
+        return step
+
+    def get_ticks(self):
+        return int(self.now)
+
+
+class Simulation:
+    TRAP_DAMAGE = {SPIKE: 10, FIRE: 20}
+    GUARDIAN_SPAWN_DISTANCE = 12  # in tiles walked from the player's start
+
+    def __init__(self, seed=None, controls=None, clock=None, fps=60, maze_size=(25, 25), tile_size=64,
+                 streaming=False, guardians=0, maze_seed=None, **world_options):
+        pygame.font.init()
+        # Always a concrete seed, so any run can be recorded and replayed
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.rng = random.Random(self.seed)
+        self.settings = dict(fps=fps, maze_size=list(maze_size), tile_size=tile_size, streaming=streaming,
+                             guardians=guardians, maze_seed=maze_seed, **world_options)
+        self.controls = controls
+        self.clock = clock or FixedClock()
+        self.fps = fps
+        self.tile_size = tile_size
+
+        self.phase = "maze"
+        self.result = None
+        self.ticks = 0
+        self.current_time = self.clock.get_ticks()
+
+        self.player = Player(50, 50)
+        self.hp_bar = HPBar(10, 10)
+
+        if streaming:
+            # Unbounded maze, generated around the player as it moves
+            self.maze = None
+            self.world = StreamingWorld(self.rng.getrandbits(63), tile_size, start_time=self.clock.get_ticks(), **world_options)
+            self.walls = pygame.sprite.Group()
+            self.traps, self.exit_rect = self.world.trap_field, self.world.exit_rect
+            self.grid = self.world
+            self.world.update(self.player.rect.center, self.clock.get_ticks())
+        else:
+            self.world = None
+            wall_img = asset_manager.image("assets/tiles/wall.png", (tile_size, tile_size))
+            self.maze = Maze(*maze_size, tile_size, wall_img, rng=self.rng)
+            # maze_seed picks a curated maze (see maze_batch.py); otherwise one from the run's seed
+            self.walls, self.traps, self.exit_rect = self.maze.create_walls(self.clock.get_ticks(), seed=maze_seed)
+            self.grid = self.maze.grid
+
+        # The streaming window stays inside the loaded chunks; a fixed maze is covered whole
+        self.flow_field = FlowField(self.grid, radius=16 if streaming else max(maze_size))
+        self.guardians = pygame.sprite.Group()
+        self.spawn_guardians(guardians)
+        self.visibility = Visibility(self.grid)
+        self.visibility.update(self.player_tile())
+
+        self.boss_map = None
+        self.player_projectiles = pygame.sprite.Group()
+
+    def player_tile(self):
+        center = self.player.hitbox.center
+        return center[0] // self.tile_size, center[1] // self.tile_size
+
+    def spawn_guardians(self, count):
+        self.flow_field.update(self.player_tile())
+        cells = self.flow_field.cells_between(self.GUARDIAN_SPAWN_DISTANCE)
+        size = self.tile_size
+        for x, y in self.rng.sample(cells, min(count, len(cells))):
+            guardian = Guardian(x * size, y * size)
+            guardian.pos.update(x * size + size // 2, y * size + size // 2)
+            guardian.rect.center = guardian.hitbox.center = (round(guardian.pos.x), round(guardian.pos.y))
+            self.guardians.add(guardian)
+
+    def step(self):
+        # Advance one frame; returns "boss", "dead", "victory" or None
+        if self.result:
+            return self.result
+
+        dt = self.clock.tick(self.fps) / 1000
+        current_time = self.clock.get_ticks()
+        self.current_time = current_time
+        controls = self.controls.poll() if self.controls else NO_INPUT
+        self.ticks += 1
+
+        if self.phase == "maze":
+            return self.step_maze(dt, current_time, controls)
+        return self.step_boss(dt, current_time, controls)
+
+    def step_maze(self, dt, current_time, controls):
+        player = self.player
+        if self.world:
+            with timings.probe("world.stream"):
+                self.world.update(player.rect.center, current_time)
+        with timings.probe("player.update"):
+            player.update(dt, self.grid, controls, current_time)
+
+        # Trap state is derived from the clock, so nothing to update per frame
+        with timings.probe("traps"):
+            for kind in self.grid.active_traps_under(player.hitbox, current_time):
+                player.take_damage(self.TRAP_DAMAGE[kind], current_time, self.hp_bar)
+
+        with timings.probe("visibility"):
+            self.visibility.update(self.player_tile())
+
+        # One search per tile the player enters, then a lookup per guardian
+        with timings.probe("guardians"):
+            self.flow_field.update(self.player_tile())
+            for guardian in self.guardians:
+                guardian.update(dt, self.flow_field, player, current_time, self.hp_bar)
+
+        if player.health <= 0:
+            self.result = "dead"
+            return self.result
+
+        with timings.probe("exit_check"):
+            exited = self.grid.has_exited(player.rect)
+        if exited:
+            self.enter_boss_fight()
+            return "boss"
+        return None
+
+    def enter_boss_fight(self):
+        player = self.player
+        player.rect.topleft = (50, 50)
+        player.hitbox.topleft = (player.rect.left + 40, player.rect.top + 32)
+        self.boss_map = BossMap(rng=self.rng)
+        self.walls.empty()
+        self.traps.clear()
+        self.guardians.empty()
+        self.phase = "boss"
+
+    def step_boss(self, dt, current_time, controls):
+        player = self.player
+        with timings.probe("player.update"):
+            player.update(dt, None, controls, current_time)
+            self.player_projectiles.update(dt, current_time)
+        with timings.probe("boss_map.update"):
+            self.boss_map.update(dt, current_time, player, self.hp_bar, self.player_projectiles, controls)
+
+        if player.health <= 0:
+            self.result = "dead"
+        elif not self.boss_map.boss.alive:
+            self.result = "victory"
+        return self.result
+
+    def run(self, max_ticks):
+        for _ in range(max_ticks):
+            if self.step() in ("dead", "victory"):
+                break
+        return self.result
+
+
+if __name__ == "__main__":
+    # Unthrottled headless run, e.g. for load testing:
+    #   python src/simulation.py [ticks] [seed]
+    import sys
+    from controls import RandomWalkInput
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    sim = Simulation(seed=seed, controls=RandomWalkInput(random.Random(seed)))
+    start = time.perf_counter()
+    result = sim.run(ticks)
+    elapsed = time.perf_counter() - start
+    print(f"{sim.ticks} ticks in {elapsed:.2f}s ({sim.ticks / elapsed:.0f} ticks/s), phase={sim.phase}, result={result}")
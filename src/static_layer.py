@@ -0,0 +1,42 @@
+import pygame
+
+
+class StaticLayer:
+    def __init__(self, width, height, chunk_size=256, fill=(0, 0, 0)):
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.cols = -(-width // chunk_size)
+        self.rows = -(-height // chunk_size)
+
+        self.chunks = {}
+        for cy in range(self.rows):
+            for cx in range(self.cols):
+                rect = pygame.Rect(cx * chunk_size, cy * chunk_size, chunk_size, chunk_size)
+                rect = rect.clip(pygame.Rect(0, 0, width, height))
+                chunk = pygame.Surface(rect.size).convert()
+                chunk.fill(fill)
+                self.chunks[(cx, cy)] = (chunk, rect)
+
+    def add(self, image, pos):
+        # Bake an image into every chunk it overlaps
+        rect = image.get_rect(topleft=pos)
+        for key in self.chunk_keys(rect):
+            chunk, chunk_rect = self.chunks[key]
+            chunk.blit(image, (rect.x - chunk_rect.x, rect.y - chunk_rect.y))
+
+    def chunk_keys(self, rect):
+        size = self.chunk_size
+        first_x = max(0, rect.left // size)
+        first_y = max(0, rect.top // size)
+        last_x = min(self.cols - 1, (rect.right - 1) // size)
+        last_y = min(self.rows - 1, (rect.bottom - 1) // size)
+        for cy in range(first_y, last_y + 1):
+            for cx in range(first_x, last_x + 1):
+                yield cx, cy
+
+    def draw(self, screen, camera):
+        view = pygame.Rect(int(camera.offset.x) - 1, int(camera.offset.y) - 1, camera.width + 2, camera.height + 2)
+        for key in self.chunk_keys(view):
+            chunk, chunk_rect = self.chunks[key]
+            screen.blit(chunk, camera.apply_rect(chunk_rect))
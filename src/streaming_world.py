@@ -0,0 +1,186 @@
+import numpy as np
+import pygame
+from maze import carve_passages
+from tile_grid import TileGrid, PATH, WALL, SPIKE, FIRE
+from traps import TrapField, default_trap_kinds
+from asset_manager import asset_manager
+
+
+TRAP_BYTES = 128  # rough size of one trap slot plus its index entry
+
+
+class Chunk:
+    def __init__(self, key, cells):
+        self.key = key
+        self.cells = cells
+        self.traps = {}        # global (x, y) -> trap slot
+        self.surface = None    # baked floor and walls, built on first draw
+
+    def memory(self):
+        size = self.cells.nbytes + len(self.traps) * TRAP_BYTES
+        if self.surface is not None:
+            size += self.surface.get_width() * self.surface.get_height() * self.surface.get_bytesize()
+        return size
+
+
+class StreamingWorld(TileGrid):
+    # An unbounded maze made of fixed-size chunks. Each chunk is a small
+    # maze generated from (seed, chunk x, chunk y) alone, and owns the wall
+    # column on its left and the wall row on top with one opening in each,
+    # so neighbouring chunks always connect without knowing about each other.
+    def __init__(self, seed, tile_size=64, chunk_cells=16, view_radius=1,
+                 memory_limit_mb=96, exit_chunk=(4, 4), start_time=0):
+        self.seed = seed
+        self.tile_size = tile_size
+        self.chunk_cells = chunk_cells - chunk_cells % 2  # must be even
+        self.chunk_pixels = self.chunk_cells * tile_size
+        self.view_radius = view_radius
+        self.memory_limit = memory_limit_mb * 1024 * 1024
+        self.current_time = start_time
+
+        self.chunks = {}
+        self.traps = {}
+        self.trap_field = TrapField(default_trap_kinds(tile_size), tile_size)
+        self.centre = (0, 0)
+
+        ex = exit_chunk[0] * self.chunk_cells + self.chunk_cells - 1
+        ey = exit_chunk[1] * self.chunk_cells + self.chunk_cells - 1
+        self.exit_cell = (ex, ey)
+        self.exit_rect = self.tile_rect(ex, ey)
+
+        self.wall_img = asset_manager.image("assets/tiles/wall.png", (tile_size, tile_size))
+        self.floor_img = asset_manager.image("assets/tiles/floor.png", (tile_size, tile_size), "opaque")
+
+    # --- Generation ---------------------------------------------------------
+
+    def generate_cells(self, cx, cy):
+        size = self.chunk_cells
+        gen = np.random.default_rng([self.seed & 0xFFFFFFFF, cx + 2 ** 31, cy + 2 ** 31])
+        cells = np.ones((size, size), dtype=np.uint8)
+        carve_passages(cells, gen)
+
+        # Openings into the chunk on the left and the one above
+        cells[gen.integers(0, size // 2) * 2 + 1, 0] = PATH
+        cells[0, gen.integers(0, size // 2) * 2 + 1] = PATH
+
+        # Traps, never on the player's start or on the exit
+        origin_x, origin_y = cx * size, cy * size
+        path_cells = np.flatnonzero(cells == PATH)
+        blocked = [
+            (y - origin_y) * size + (x - origin_x)
+            for x, y in ((1, 1), self.exit_cell)
+            if 0 <= x - origin_x < size and 0 <= y - origin_y < size
+        ]
+        path_cells = gen.permutation(path_cells[~np.isin(path_cells, blocked)])
+        num_spikes = int(len(path_cells) * 0.05)
+        num_fires = int((len(path_cells) - num_spikes) * 0.03)
+        flat = cells.reshape(-1)
+        flat[path_cells[:num_spikes]] = SPIKE
+        flat[path_cells[num_spikes:num_spikes + num_fires]] = FIRE
+        return cells
+
+    def load_chunk(self, cx, cy):
+        chunk = Chunk((cx, cy), self.generate_cells(cx, cy))
+        size = self.chunk_cells
+        for kind in (SPIKE, FIRE):
+            ys, xs = np.nonzero(chunk.cells == kind)
+            xs, ys = xs + cx * size, ys + cy * size
+            slots = self.trap_field.add_many(xs, ys, kind, self.current_time)
+            chunk.traps.update(zip(zip(xs.tolist(), ys.tolist()), slots))
+        self.traps.update(chunk.traps)
+        self.chunks[(cx, cy)] = chunk
+        self.evict()
+        return chunk
+
+    def unload_chunk(self, key):
+        chunk = self.chunks.pop(key)
+        for pos, slot in chunk.traps.items():
+            del self.traps[pos]
+            self.trap_field.remove(slot)
+
+    def get_chunk(self, cx, cy):
+        chunk = self.chunks.get((cx, cy))
+        if chunk is None:
+            chunk = self.load_chunk(cx, cy)
+        return chunk
+
+    # --- Streaming ----------------------------------------------------------
+
+    def update(self, pos, current_time):
+        # Keep every chunk within view_radius of pos loaded
+        self.current_time = current_time
+        cx, cy = int(pos[0]) // self.chunk_pixels, int(pos[1]) // self.chunk_pixels
+        self.centre = (cx, cy)
+        r = self.view_radius
+        for y in range(cy - r, cy + r + 1):
+            for x in range(cx - r, cx + r + 1):
+                if (x, y) not in self.chunks:
+                    self.load_chunk(x, y)
+
+    def memory(self):
+        return sum(chunk.memory() for chunk in self.chunks.values())
+
+    def evict(self):
+        used = self.memory()
+        if used <= self.memory_limit:
+            return
+        cx, cy = self.centre
+        r = self.view_radius
+        by_distance = sorted(self.chunks, key=lambda key: max(abs(key[0] - cx), abs(key[1] - cy)), reverse=True)
+        for key in by_distance:
+            if used <= self.memory_limit or max(abs(key[0] - cx), abs(key[1] - cy)) <= r:
+                break
+            used -= self.chunks[key].memory()
+            self.unload_chunk(key)
+
+    # --- TileGrid queries ---------------------------------------------------
+
+    def cell(self, x, y):
+        size = self.chunk_cells
+        chunk = self.get_chunk(x // size, y // size)
+        return int(chunk.cells[y % size, x % size])
+
+    def region(self, x, y, width, height, fill=PATH):
+        # Copied chunk by chunk; the world has no outside, so fill is unused
+        size = self.chunk_cells
+        out = np.empty((height, width), dtype=np.uint8)
+        for cy in range(y // size, (y + height - 1) // size + 1):
+            for cx in range(x // size, (x + width - 1) // size + 1):
+                cells = self.get_chunk(cx, cy).cells
+                x0, y0 = max(x, cx * size), max(y, cy * size)
+                x1, y1 = min(x + width, (cx + 1) * size), min(y + height, (cy + 1) * size)
+                out[y0 - y:y1 - y, x0 - x:x1 - x] = cells[y0 - cy * size:y1 - cy * size, x0 - cx * size:x1 - cx * size]
+        return out
+
+    def has_exited(self, rect):
+        return self.exit_rect.colliderect(rect)
+
+    # --- Rendering ----------------------------------------------------------
+
+    def bake(self, chunk):
+        size, tile = self.chunk_cells, self.tile_size
+        surface = pygame.Surface((self.chunk_pixels, self.chunk_pixels)).convert()
+        for y in range(size):
+            for x in range(size):
+                surface.blit(self.floor_img, (x * tile, y * tile))
+                if chunk.cells[y, x] == WALL:
+                    surface.blit(self.wall_img, (x * tile, y * tile))
+        cx, cy = chunk.key
+        ex, ey = self.exit_cell
+        if ex // size == cx and ey // size == cy:
+            pygame.draw.rect(surface, (200, 170, 60), ((ex % size) * tile, (ey % size) * tile, tile, tile), 4)
+        chunk.surface = surface
+
+    def draw(self, screen, camera):
+        pixels = self.chunk_pixels
+        first_x = int(camera.offset.x) // pixels
+        first_y = int(camera.offset.y) // pixels
+        last_x = (int(camera.offset.x) + camera.width) // pixels
+        last_y = (int(camera.offset.y) + camera.height) // pixels
+        for cy in range(first_y, last_y + 1):
+            for cx in range(first_x, last_x + 1):
+                chunk = self.get_chunk(cx, cy)
+                if chunk.surface is None:
+                    self.bake(chunk)
+                    self.evict()
+                screen.blit(chunk.surface, camera.apply_rect(pygame.Rect(cx * pixels, cy * pixels, pixels, pixels)))
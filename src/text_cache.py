@@ -0,0 +1,58 @@
+from collections import OrderedDict
+import pygame
+
+
+class TextCache:
+    # Fonts are loaded once per (name, size, sysfont). Rendered lines are kept
+    # in an LRU keyed by (font, text, color, antialias), so text that does not
+    # change between frames only costs a blit.
+    def __init__(self, max_entries=256):
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, name=None, size=24, sysfont=True):
+        key = (name, size, sysfont)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            try:
+                font = pygame.font.SysFont(name, size) if sysfont else pygame.font.Font(name, size)
+            except Exception as e:
+                print(f"[Error] Failed to load font {name}: {e}")
+                font = pygame.font.Font(None, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "fonts": len(self.fonts),
+            "surfaces": len(self.surfaces),
+        }
+
+    def clear(self):
+        self.fonts.clear()
+        self.surfaces.clear()
+
+
+text_cache = TextCache()
@@ -0,0 +1,61 @@
+import numpy as np
+import pygame
+
+PATH, WALL, SPIKE, FIRE = 0, 1, 2, 3
+
+
+class TileGrid:
+    def __init__(self, cells, tile_size, exit_rect=None, trap_field=None):
+        self.cells = cells
+        self.rows = len(cells)
+        self.cols = len(cells[0]) if len(cells) else 0
+        self.tile_size = tile_size
+        self.exit_rect = exit_rect
+        self.trap_field = trap_field
+        self.traps = {}  # (x, y) -> slot in trap_field
+
+    def add_trap(self, x, y, slot):
+        self.traps[(x, y)] = slot
+
+    def cell(self, x, y):
+        # Everything outside the grid is open floor
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return self.cells[y][x]
+        return PATH
+
+    def region(self, x, y, width, height, fill=PATH):
+        # Cells of a width x height window at (x, y) as a uint8 array, with
+        # everything outside the grid set to fill
+        out = np.full((height, width), fill, dtype=np.uint8)
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, self.cols), min(y + height, self.rows)
+        if x0 < x1 and y0 < y1:
+            out[y0 - y:y1 - y, x0 - x:x1 - x] = np.asarray(self.cells)[y0:y1, x0:x1]
+        return out
+
+    def cells_under(self, rect):
+        size = self.tile_size
+        for y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for x in range(rect.left // size, (rect.right - 1) // size + 1):
+                yield x, y
+
+    def collides(self, rect):
+        for x, y in self.cells_under(rect):
+            if self.cell(x, y) == WALL:
+                return True
+        return False
+
+    def active_traps_under(self, rect, current_time):
+        found = [
+            int(self.cell(x, y))
+            for x, y in self.cells_under(rect)
+            if (x, y) in self.traps and self.trap_field.is_active(self.traps[(x, y)], current_time)
+        ]
+        found.sort()  # spikes before fires
+        return found
+
+    def has_exited(self, rect):
+        return self.exit_rect is not None and rect.left > self.exit_rect.right
+
+    def tile_rect(self, x, y):
+        return pygame.Rect(x * self.tile_size, y * self.tile_size, self.tile_size, self.tile_size)
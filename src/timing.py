@@ -0,0 +1,164 @@
+import csv
+import json
+import time
+import numpy as np
+import pygame
+from text_cache import text_cache
+
+
+class NullProbe:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_PROBE = NullProbe()
+
+
+class Probe:
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.current[self.name] = self.timer.current.get(self.name, 0.0) + time.perf_counter() - self.start
+        return False
+
+
+class FrameTimer:
+    # Per-subsystem frame timings. Probes add into the current frame, and
+    # end_frame() pushes every subsystem's total into a fixed-size ring
+    # buffer. While disabled, probe() hands back a shared no-op.
+    FRAME = "frame"
+
+    def __init__(self, capacity=600):
+        self.capacity = capacity
+        self.enabled = False
+        self.overlay = False
+        self.probes = {}
+        self.current = {}
+        self.samples = {}   # name -> ring buffer of ms
+        self.count = 0      # frames recorded so far
+        self.last_end = None
+        self.overlay_images = []
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+        self.last_end = None
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        if self.overlay and not self.enabled:
+            self.enable()
+
+    def probe(self, name):
+        if not self.enabled:
+            return NULL_PROBE
+        probe = self.probes.get(name)
+        if probe is None:
+            probe = self.probes[name] = Probe(self, name)
+        return probe
+
+    def add(self, name, seconds):
+        # Time measured elsewhere, e.g. by the audio manager
+        if self.enabled:
+            self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.last_end is not None:
+            self.current[self.FRAME] = now - self.last_end
+        self.last_end = now
+
+        slot = self.count % self.capacity
+        for name in self.current.keys() - self.samples.keys():
+            self.samples[name] = np.zeros(self.capacity, dtype=np.float32)
+        for name, buffer in self.samples.items():
+            buffer[slot] = self.current.get(name, 0.0) * 1000
+        self.current = {}
+        self.count += 1
+
+    def recent(self, name):
+        # Samples in the order they were taken, oldest first
+        buffer = self.samples.get(name)
+        if buffer is None:
+            return np.zeros(0, dtype=np.float32)
+        if self.count < self.capacity:
+            return buffer[:self.count]
+        return np.roll(buffer, -(self.count % self.capacity))
+
+    def stats(self):
+        stats = {}
+        for name in sorted(self.samples):
+            values = self.recent(name)
+            if not len(values):
+                continue
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            stats[name] = {
+                "mean_ms": round(float(values.mean()), 4),
+                "p50_ms": round(float(p50), 4),
+                "p95_ms": round(float(p95), 4),
+                "p99_ms": round(float(p99), 4),
+                "max_ms": round(float(values.max()), 4),
+                "frames": int(len(values)),
+            }
+        return stats
+
+    def export(self, path):
+        stats = self.stats()
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["subsystem", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "frames"])
+                for name, row in stats.items():
+                    writer.writerow([name] + [row[key] for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "frames")])
+        else:
+            with open(path, "w") as f:
+                json.dump(stats, f, indent=2)
+
+    def draw_overlay(self, surface, graph_frames=120, refresh_every=30):
+        if not self.overlay or not self.count:
+            return
+        font = text_cache.font(None, 18)
+
+        # Averages change every frame, so only re-render the text now and then
+        if not self.overlay_images or self.count % refresh_every == 0:
+            self.overlay_images = [
+                font.render(f"{name}: {float(self.recent(name)[-refresh_every:].mean()):.2f} ms", True, (255, 255, 0))
+                for name in sorted(self.samples)
+            ]
+
+        width, height = 200, 60
+        x = surface.get_width() - width - 10
+        y = 10
+        panel = pygame.Rect(x, y, width, height + 8 + 16 * len(self.overlay_images))
+        surface.fill((0, 0, 0), panel)
+
+        # Frame-time graph, 0 to 33 ms, with a line at 16.7 ms
+        frames = self.recent(self.FRAME)[-graph_frames:]
+        if len(frames) > 1:
+            step = width / (graph_frames - 1)
+            points = [
+                (x + i * step, y + height - min(ms, 33.3) / 33.3 * height)
+                for i, ms in enumerate(frames.tolist())
+            ]
+            budget_y = y + height - height / 2
+            pygame.draw.line(surface, (90, 90, 90), (x, budget_y), (x + width, budget_y))
+            pygame.draw.lines(surface, (0, 255, 0), False, points)
+
+        surface.blits(
+            [(image, (x + 4, y + height + 6 + i * 16)) for i, image in enumerate(self.overlay_images)],
+            doreturn=False
+        )
+
+
+timings = FrameTimer()
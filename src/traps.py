@@ -0,0 +1,131 @@
+import numpy as np
+from tile_grid import SPIKE, FIRE
+from asset_manager import asset_manager
+
+
+class TrapKind:
+    # Frames play forward then back (ping-pong), the trap hides for
+    # invisible_duration, then the cycle starts again.
+    def __init__(self, images, frame_duration=150, invisible_duration=1500, light_radius=0):
+        self.images = images
+        self.frame_duration = frame_duration
+        self.invisible_duration = invisible_duration
+        self.light_radius = light_radius
+
+        n = len(images)
+        self.steps = n * 2 - 2  # frame steps in one visible run
+        # After the first run the trap reappears straight on frame 1
+        self.cycle = invisible_duration + (self.steps - 1) * frame_duration
+
+    def state(self, elapsed):
+        # elapsed: ms since the trap was placed (int or NumPy array).
+        # Returns (visible, frame index); both derived from time only.
+        n = len(self.images)
+        fd, inv = self.frame_duration, self.invisible_duration
+        u = (elapsed - self.steps * fd) % self.cycle
+        first_frame = elapsed < fd
+        visible = (u >= inv) | first_frame
+        step = np.where(first_frame, 0, 1 + (u - inv) // fd)
+        step = np.clip(step, 0, self.steps - 1)
+        frame = np.where(step < n, step, self.steps - step)
+        return visible, frame
+
+
+def default_trap_kinds(tile_size):
+    size = (tile_size, tile_size)
+    return {
+        SPIKE: TrapKind([asset_manager.image(f"assets/tiles/spike_{i}.png", size) for i in range(1, 5)]),
+        FIRE: TrapKind([asset_manager.image(f"assets/tiles/fire_{i}.png", size) for i in range(1, 13)], light_radius=96),
+    }
+
+
+class TrapField:
+    # All traps of a level as parallel arrays. Removed slots are reused, so
+    # slot numbers handed out by add() stay valid for the trap's lifetime.
+    def __init__(self, kinds, tile_size, capacity=64):
+        self.kinds = kinds
+        self.tile_size = tile_size
+        self.x = np.zeros(capacity, dtype=np.int32)      # tile coordinates
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.kind = np.zeros(capacity, dtype=np.uint8)
+        self.phase = np.zeros(capacity, dtype=np.int64)  # time the trap was placed
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def grow(self):
+        old = len(self.alive)
+        for name in ("x", "y", "kind", "phase", "alive"):
+            arr = getattr(self, name)
+            setattr(self, name, np.concatenate([arr, np.zeros(old, dtype=arr.dtype)]))
+        self.free.extend(range(old * 2 - 1, old - 1, -1))
+
+    def add(self, x, y, kind, start_time):
+        if not self.free:
+            self.grow()
+        slot = self.free.pop()
+        self.x[slot], self.y[slot] = x, y
+        self.kind[slot] = kind
+        self.phase[slot] = start_time
+        self.alive[slot] = True
+        return slot
+
+    def add_many(self, xs, ys, kind, start_time):
+        return [self.add(int(x), int(y), kind, start_time) for x, y in zip(xs, ys)]
+
+    def remove(self, slot):
+        self.alive[slot] = False
+        self.free.append(slot)
+
+    def clear(self):
+        self.alive[:] = False
+        self.free = list(range(len(self.alive) - 1, -1, -1))
+
+    def is_active(self, slot, current_time):
+        visible, _ = self.kinds[int(self.kind[slot])].state(current_time - int(self.phase[slot]))
+        return bool(visible)
+
+    def in_view(self, camera, margin=0):
+        tile = self.tile_size
+        sx = self.x * tile - int(camera.offset.x)
+        sy = self.y * tile - int(camera.offset.y)
+        mask = (
+            self.alive &
+            (sx > -tile - margin) & (sx < camera.width + margin) &
+            (sy > -tile - margin) & (sy < camera.height + margin)
+        )
+        return mask, sx, sy
+
+    def draw(self, screen, camera, current_time):
+        mask, sx, sy = self.in_view(camera)
+        for kind_id, kind in self.kinds.items():
+            slots = np.flatnonzero(mask & (self.kind == kind_id))
+            if not len(slots):
+                continue
+            visible, frames = kind.state(current_time - self.phase[slots])
+            slots, frames = slots[visible], frames[visible]
+            images = kind.images
+            screen.blits(
+                [(images[f], (x, y)) for f, x, y in zip(frames.tolist(), sx[slots].tolist(), sy[slots].tolist())],
+                doreturn=False
+            )
+
+    def lights(self, camera, current_time):
+        half = self.tile_size // 2
+        lights = []
+        for kind_id, kind in self.kinds.items():
+            if not kind.light_radius:
+                continue
+            mask, sx, sy = self.in_view(camera, margin=kind.light_radius)
+            slots = np.flatnonzero(mask & (self.kind == kind_id))
+            if not len(slots):
+                continue
+            visible, _ = kind.state(current_time - self.phase[slots])
+            slots = slots[visible]
+            lights.extend(
+                ((x + half, y + half), kind.light_radius)
+                for x, y in zip(sx[slots].tolist(), sy[slots].tolist())
+            )
+        return lights
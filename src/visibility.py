@@ -0,0 +1,146 @@
+import numpy as np
+import pygame
+from tile_grid import WALL
+
+# (xx, xy, yx, yy) transforms of the one octant cast_light() walks into all eight
+OCTANTS = (
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1),
+)
+EXPLORED_CHUNK = 32  # explored tiles are kept as one bitmap per 32x32 tiles
+
+
+class Visibility:
+    # Line of sight from the player's tile by recursive shadowcasting, with
+    # walls blocking it. Recomputed only when the player enters another
+    # tile; tiles seen once stay explored. fog() turns it into per-tile
+    # darkness surfaces for the lighting pass, rebuilt only after an update.
+    def __init__(self, grid, radius=5):
+        self.grid = grid
+        self.tile_size = grid.tile_size
+        self.radius = radius
+        self.origin = None
+        self.visible = set()
+        self.explored = {}  # (chunk x, chunk y) -> bool array indexed [x, y]
+        self.fog_key = None
+        self.fog_surfaces = None
+        self.updates = 0
+
+    def update(self, tile):
+        # Returns True if line of sight had to be recomputed
+        if tile == self.origin:
+            return False
+        self.origin = tile
+        self.visible = self.cast(tile)
+        n = EXPLORED_CHUNK
+        for x, y in self.visible:
+            chunk = self.explored.get((x // n, y // n))
+            if chunk is None:
+                chunk = self.explored[x // n, y // n] = np.zeros((n, n), dtype=bool)
+            chunk[x % n, y % n] = True
+        self.updates += 1
+        return True
+
+    def cast(self, tile):
+        cx, cy = tile
+        r = self.radius
+        size = 2 * r + 1
+        opaque = (self.grid.region(cx - r, cy - r, size, size) == WALL).tobytes()
+        visible = {tile}
+        for xx, xy, yx, yy in OCTANTS:
+            self.cast_light(opaque, size, r, visible, cx, cy, 1, 1.0, 0.0, xx, xy, yx, yy)
+        return visible
+
+    def cast_light(self, opaque, size, r, visible, cx, cy, row, start, end, xx, xy, yx, yy):
+        # One octant, row by row outwards; a wall splits the lit slope range
+        # and the part beyond it continues in a recursive call
+        if start < end:
+            return
+        radius_sq = r * r
+        new_start = start
+        for j in range(row, r + 1):
+            dy = -j
+            blocked = False
+            for dx in range(-j, 1):
+                left_slope = (dx - 0.5) / (dy + 0.5)
+                right_slope = (dx + 0.5) / (dy - 0.5)
+                if start < right_slope:
+                    continue
+                if end > left_slope:
+                    break
+                ox, oy = dx * xx + dy * xy, dx * yx + dy * yy
+                if dx * dx + dy * dy <= radius_sq:
+                    visible.add((cx + ox, cy + oy))
+                wall = opaque[(oy + r) * size + ox + r]
+                if blocked:
+                    if wall:
+                        new_start = right_slope
+                    else:
+                        blocked = False
+                        start = new_start
+                elif wall and j < r:
+                    blocked = True
+                    self.cast_light(opaque, size, r, visible, cx, cy, j + 1, start, left_slope, xx, xy, yx, yy)
+                    new_start = right_slope
+            if blocked:
+                break
+
+    def is_visible(self, x, y):
+        return (x, y) in self.visible
+
+    def is_explored(self, x, y):
+        n = EXPLORED_CHUNK
+        chunk = self.explored.get((x // n, y // n))
+        return chunk is not None and bool(chunk[x % n, y % n])
+
+    def explored_window(self, x0, y0, width, height):
+        # Bool array indexed [x, y] for the tiles of a window, sliced from
+        # the chunk bitmaps it overlaps
+        n = EXPLORED_CHUNK
+        window = np.zeros((width, height), dtype=bool)
+        for cy in range(y0 // n, (y0 + height - 1) // n + 1):
+            for cx in range(x0 // n, (x0 + width - 1) // n + 1):
+                chunk = self.explored.get((cx, cy))
+                if chunk is None:
+                    continue
+                ax, ay = max(x0, cx * n), max(y0, cy * n)
+                bx, by = min(x0 + width, (cx + 1) * n), min(y0 + height, (cy + 1) * n)
+                window[ax - x0:bx - x0, ay - y0:by - y0] = chunk[ax - cx * n:bx - cx * n, ay - cy * n:by - cy * n]
+        return window
+
+    def fog(self, camera, view_size, darkness):
+        # (base, mask, screen position) covering the view around the player's
+        # tile. mask is clear where visible, darkness where explored and black
+        # elsewhere; base is the darkness layer to start a frame from, mask
+        # with nothing below darkness. Rebuilt only when visibility or the
+        # view changes.
+        size = self.tile_size
+        half_w = view_size[0] // (2 * size) + 2
+        half_h = view_size[1] // (2 * size) + 2
+        cx, cy = self.origin
+        key = (self.updates, half_w, half_h, darkness)
+        if key != self.fog_key:
+            x0, y0 = cx - half_w, cy - half_h
+            width, height = 2 * half_w + 1, 2 * half_h + 1
+            alpha = np.where(self.explored_window(x0, y0, width, height), np.uint8(darkness), np.uint8(255))
+            for x, y in self.visible:
+                if 0 <= x - x0 < width and 0 <= y - y0 < height:
+                    alpha[x - x0, y - y0] = 0
+
+            surface_size = (width * size, height * size)
+            if self.fog_surfaces is None or self.fog_surfaces[0].get_size() != surface_size:
+                base = pygame.Surface(surface_size, pygame.SRCALPHA)
+                base.set_alpha(None)  # blitting the base copies its alpha as it is
+                self.fog_surfaces = (base, pygame.Surface(surface_size, pygame.SRCALPHA))
+            base, mask = self.fog_surfaces
+            base.fill((0, 0, 0, 255))
+            mask.fill((0, 0, 0, 255))
+            # Only the few seen tiles differ from black
+            xs, ys = np.nonzero(alpha != 255)
+            for x, y, value in zip(xs.tolist(), ys.tolist(), alpha[xs, ys].tolist()):
+                rect = (x * size, y * size, size, size)
+                base.fill((0, 0, 0, darkness), rect)
+                mask.fill((0, 0, 0, value), rect)
+            self.fog_key = key
+        pos = ((cx - half_w) * size - camera.offset.x, (cy - half_h) * size - camera.offset.y)
+        return self.fog_surfaces[0], self.fog_surfaces[1], pos